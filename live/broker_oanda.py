@@ -1,80 +1,171 @@
 """Thin OANDA order wrapper (practice/live toggle via config)."""
-import requests
-from live.config import OANDA_API_BASE, OANDA_API_TOKEN, OANDA_ACCOUNT_ID, OANDA_INSTRUMENT
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+import orjson
+
+from live.config import (
+    OANDA_API_BASE, OANDA_ACCOUNT_ID, OANDA_INSTRUMENT, OANDA_SUMMARY_TTL, OANDA_SPREAD_TTL,
+    OANDA_TRADES_TTL,
+)
+from live.http_client import SESSION, parse_json
 from live.logging_utils import setup_logger
 
 logger = setup_logger("broker")
 
 
-def _headers():
-    return {
-        "Authorization": f"Bearer {OANDA_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
+def ttl_cache(seconds: float):
+    """Memoize a no-arg/hashable-arg call for `seconds`; exposes `.invalidate()`,
+    `.refresh(...)` (always call through and re-cache) and `.prime(value, ...)`
+    (cache a value obtained some other way, e.g. from a combined request)."""
+    def decorator(fn):
+        cache = {}
+
+        def prime(value, *args, **kwargs):
+            cache[(args, tuple(sorted(kwargs.items())))] = (time.monotonic(), value)
+
+        def refresh(*args, **kwargs):
+            value = fn(*args, **kwargs)
+            prime(value, *args, **kwargs)
+            return value
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            hit = cache.get((args, tuple(sorted(kwargs.items()))))
+            if hit is not None and time.monotonic() - hit[0] < seconds:
+                return hit[1]
+            return refresh(*args, **kwargs)
+
+        wrapper.invalidate = cache.clear
+        wrapper.refresh = refresh
+        wrapper.prime = prime
+        return wrapper
+    return decorator
+
+
+ORDERS_URL = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/orders"
+_PX = "{:.2f}".format  # bound once; avoids re-parsing the format spec per order
+# Fields that never change between orders; each call only adds units and SL/TP.
+_MARKET_ORDER_STATIC = {
+    "instrument": OANDA_INSTRUMENT,
+    "type": "MARKET",
+    "positionFill": "DEFAULT",
+}
 
 
 def submit_market_with_sl_tp(units: int, sl_price: float = None, tp_price: float = None, sl_distance: float = None, tp_distance: float = None):
     """Place a market order with attached SL/TP. Supports fixed Price OR Distance."""
-    url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/orders"
-    
-    order_body = {
-        "units": str(units),
-        "instrument": OANDA_INSTRUMENT,
-        "type": "MARKET",
-        "positionFill": "DEFAULT",
-    }
+    url = ORDERS_URL
+    order_body = {**_MARKET_ORDER_STATIC, "units": str(units)}
     
     # Handle Stop Loss (Distance takes priority if both provided, or use logic as needed)
     if sl_distance is not None:
-        order_body["stopLossOnFill"] = {"distance": f"{sl_distance:.2f}"}
+        order_body["stopLossOnFill"] = {"distance": _PX(sl_distance)}
     elif sl_price is not None:
-        order_body["stopLossOnFill"] = {"price": f"{sl_price:.2f}"}
+        order_body["stopLossOnFill"] = {"price": _PX(sl_price)}
         
     # Handle Take Profit
     if tp_distance is not None:
-        order_body["takeProfitOnFill"] = {"distance": f"{tp_distance:.2f}"}
+        order_body["takeProfitOnFill"] = {"distance": _PX(tp_distance)}
     elif tp_price is not None:
-        order_body["takeProfitOnFill"] = {"price": f"{tp_price:.2f}"}
+        order_body["takeProfitOnFill"] = {"price": _PX(tp_price)}
 
     body = {"order": order_body}
-    resp = requests.post(url, headers=_headers(), json=body, timeout=10)
+    resp = SESSION.post(url, data=orjson.dumps(body), timeout=10)
     resp.raise_for_status()
+    # Balance/margin/open trades change on fill; don't serve stale copies afterwards.
+    get_account_summary.invalidate()
+    get_open_trades.invalidate()
     logger.info(f"Order sent units={units} sl_dist={sl_distance} tp_dist={tp_distance} (or px {sl_price}/{tp_price})")
-    return resp.json()
+    return parse_json(resp)
+
+
+def close_position(instrument: str = OANDA_INSTRUMENT, long: bool = True, short: bool = True):
+    """Close the whole long and/or short position on `instrument` in one request."""
+    url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/positions/{instrument}/close"
+    body = {}
+    if long:
+        body["longUnits"] = "ALL"
+    if short:
+        body["shortUnits"] = "ALL"
+    resp = SESSION.put(url, data=orjson.dumps(body), timeout=10)
+    resp.raise_for_status()
+    return parse_json(resp)
+
+
+def _close_trades_individually(trades):
+    urls = [f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/trades/{t['id']}/close" for t in trades if t.get("id")]
+    results = []
+    if urls:
+        # Close PUTs are independent; send them concurrently over the pooled session.
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+            for r in pool.map(lambda u: SESSION.put(u, timeout=10), urls):
+                r.raise_for_status()
+                results.append(parse_json(r))
+    return results
 
 
 def close_all_trades():
-    url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/trades"
-    trades = requests.get(url, headers=_headers(), timeout=10).json().get("trades", [])
+    """Close every open trade; returns (trades closed, broker responses).
+    The response list can be shorter than the count: a positions/close covers all trades at once."""
+    trades = get_open_trades.refresh()
     results = []
-    for t in trades:
-        tid = t.get("id")
-        if not tid:
-            continue
-        c_url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/trades/{tid}/close"
-        r = requests.put(c_url, headers=_headers(), timeout=10)
-        r.raise_for_status()
-        results.append(r.json())
+    instruments = {t.get("instrument") for t in trades}
+    if trades and instruments == {OANDA_INSTRUMENT}:
+        # Single-instrument book: one positions/close call flattens every trade.
+        units = [float(t.get("currentUnits", 0)) for t in trades]
+        try:
+            results = [close_position(long=any(u > 0 for u in units), short=any(u < 0 for u in units))]
+        except Exception as e:
+            logger.warning(f"Position close failed ({e}); closing trades individually.")
+    if trades and not results:
+        results = _close_trades_individually(trades)
     if results:
-        logger.info(f"Closed trades: {len(results)}")
-    return results
+        get_account_summary.invalidate()
+        get_open_trades.invalidate()
+        logger.info(f"Closed trades: {len(trades)} in {len(results)} request(s)")
+    return (len(trades) if results else 0), results
 
 
+@ttl_cache(OANDA_TRADES_TTL)
 def get_open_trades():
     url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/trades"
-    resp = requests.get(url, headers=_headers(), timeout=10)
+    resp = SESSION.get(url, timeout=10)
     resp.raise_for_status()
-    trades = resp.json().get("trades", [])
-    logger.debug(f"Open trades: {len(trades)}")
+    trades = parse_json(resp).get("trades", [])
+    logger.debug("Open trades: %d", len(trades))
     return trades
 
 
+@ttl_cache(OANDA_SUMMARY_TTL)
 def get_account_summary():
     """Fetch account summary (balance, NAV, open trade count)."""
     url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/summary"
-    resp = requests.get(url, headers=_headers(), timeout=10)
+    resp = SESSION.get(url, timeout=10)
     resp.raise_for_status()
-    acct = resp.json().get("account", {})
+    summary = _parse_account_summary(parse_json(resp).get("account", {}))
+    logger.debug("Account summary: nav=%s bal=%s utpl=%s", summary["nav"], summary["balance"], summary["unrealized_pl"])
+    return summary
+
+
+def get_account_full():
+    """Account summary and open trades from one GET /accounts/{id} round trip.
+    Returns (summary, trades) and primes both TTL caches with the result."""
+    url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}"
+    resp = SESSION.get(url, timeout=10)
+    resp.raise_for_status()
+    acct = parse_json(resp).get("account", {})
+    summary = _parse_account_summary(acct)
+    trades = acct.get("trades", [])
+    get_account_summary.prime(summary)
+    get_open_trades.prime(trades)
+    logger.debug("Account full: nav=%s bal=%s open_trades=%d", summary["nav"], summary["balance"], len(trades))
+    return summary, trades
+
+
+def _parse_account_summary(acct: dict) -> dict:
     # Safely cast to floats/ints; OANDA returns strings
     def _f(k, default=0.0):
         try:
@@ -88,7 +179,7 @@ def get_account_summary():
         except Exception:
             return default
 
-    summary = {
+    return {
         "balance": _f("balance"),
         "nav": _f("NAV"),
         "unrealized_pl": _f("unrealizedPL"),
@@ -98,29 +189,75 @@ def get_account_summary():
         "open_trade_count": _i("openTradeCount"),
         "last_transaction_id": acct.get("lastTransactionID"),
     }
-    logger.debug(f"Account summary: nav={summary['nav']} bal={summary['balance']} utpl={summary['unrealized_pl']}")
-    return summary
+
+
+def ping():
+    """Cheap authenticated GET that keeps the pooled connection from idling out."""
+    resp = SESSION.get(f"{OANDA_API_BASE}/accounts", timeout=5)
+    resp.raise_for_status()
 
 
 def get_accounts():
     """Fetch list of all accounts authorized for this token."""
     url = f"{OANDA_API_BASE}/accounts"
-    resp = requests.get(url, headers=_headers(), timeout=10)
+    resp = SESSION.get(url, timeout=10)
     resp.raise_for_status()
-    return resp.json()
+    return parse_json(resp)
 
-def get_current_spread() -> float:
-    """Fetch current spread (Ask - Bid) for the configured instrument."""
+@ttl_cache(OANDA_SPREAD_TTL)
+def get_spreads(instruments: tuple) -> dict:
+    """Fetch spread (Ask - Bid) for several instruments in one pricing request."""
     url = f"{OANDA_API_BASE}/accounts/{OANDA_ACCOUNT_ID}/pricing"
-    params = {"instruments": OANDA_INSTRUMENT}
+    params = {"instruments": ",".join(instruments)}
     try:
-        resp = requests.get(url, headers=_headers(), params=params, timeout=5)
+        resp = SESSION.get(url, params=params, timeout=5)
         resp.raise_for_status()
-        prices = resp.json().get("prices", [])
-        if prices:
-            bid = float(prices[0]["bids"][0]["price"])
-            ask = float(prices[0]["asks"][0]["price"])
-            return ask - bid
+        prices = parse_json(resp).get("prices", [])
+        return {
+            p["instrument"]: float(p["asks"][0]["price"]) - float(p["bids"][0]["price"])
+            for p in prices
+        }
     except Exception as e:
         logger.warning(f"Failed to fetch spread: {e}")
-    return 0.0
+    return {}
+
+
+def get_current_spread(instruments=None):
+    """Fetch current spread (Ask - Bid).
+    None/a single instrument returns a float (default: the configured instrument);
+    a list returns {instrument: spread} from one batched request."""
+    if instruments is None or isinstance(instruments, str):
+        inst = instruments or OANDA_INSTRUMENT
+        return get_spreads((inst,)).get(inst, 0.0)
+    return get_spreads(tuple(sorted(instruments)))
+
+
+# Awaitable twins: run the blocking call on a worker thread over the pooled SESSION
+# so independent broker/notifier/data calls can overlap under asyncio.gather.
+async def submit_market_with_sl_tp_async(*args, **kwargs):
+    return await asyncio.to_thread(submit_market_with_sl_tp, *args, **kwargs)
+
+
+async def close_all_trades_async():
+    return await asyncio.to_thread(close_all_trades)
+
+
+async def ping_async():
+    return await asyncio.to_thread(ping)
+
+
+async def get_open_trades_async(fresh: bool = False):
+    """`fresh=True` bypasses the TTL cache (e.g. to spot a broker-side SL/TP close)."""
+    return await asyncio.to_thread(get_open_trades.refresh if fresh else get_open_trades)
+
+
+async def get_account_summary_async():
+    return await asyncio.to_thread(get_account_summary)
+
+
+async def get_account_full_async():
+    return await asyncio.to_thread(get_account_full)
+
+
+async def get_current_spread_async(instruments=None):
+    return await asyncio.to_thread(get_current_spread, instruments)
@@ -1,8 +1,14 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 import yaml
 
+try:  # libyaml's C parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Load .env if present
 load_dotenv()
 
@@ -10,10 +16,12 @@ ROOT = Path(__file__).resolve().parent.parent
 CONFIG_DIR = ROOT / "config"
 
 
+@lru_cache(maxsize=None)
 def load_yaml(name: str):
+    """Parse config/<name> once per process (callers share the returned dict)."""
     path = CONFIG_DIR / name
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def get_env(key: str, default=None):
@@ -25,6 +33,10 @@ OANDA_API_TOKEN  = get_env("OANDA_API_TOKEN", "")
 OANDA_ENV        = get_env("OANDA_ENV", "practice")  # practice | live
 OANDA_INSTRUMENT = get_env("OANDA_INSTRUMENT", "NAS100_USD")
 OANDA_TIMEZONE   = get_env("OANDA_TIMEZONE", "America/New_York")
+OANDA_SUMMARY_TTL = float(get_env("OANDA_SUMMARY_TTL", "5"))  # seconds
+OANDA_SPREAD_TTL  = float(get_env("OANDA_SPREAD_TTL", "1"))   # seconds
+OANDA_TRADES_TTL  = float(get_env("OANDA_TRADES_TTL", "60"))  # seconds
+OANDA_CANDLES_TTL = float(get_env("OANDA_CANDLES_TTL", "5"))  # seconds
 
 # Base URLs
 if OANDA_ENV == "live":
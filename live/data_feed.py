@@ -1,74 +1,188 @@
-"""Minimal OANDA M1 candle fetcher (polling) with UTC→NY conversion.
-This keeps dependencies light; swap to streaming if desired.
+"""Minimal OANDA M1 candle fetcher (incremental polling) with UTC→NY conversion.
+This keeps dependencies light. OANDA's pricing stream (OANDA_STREAM_BASE) only
+pushes bid/ask ticks, not the smoothed mid M1 candles the strategy and replays
+are built on, so candles are polled incrementally rather than rebuilt from ticks.
 """
+import asyncio
+import logging
 import time
-from datetime import datetime, timezone
-from pathlib import Path
+from threading import Lock
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import orjson
 import pandas as pd
-import pytz
+from zoneinfo import ZoneInfo
 
-from live.config import OANDA_API_BASE, OANDA_API_TOKEN, OANDA_INSTRUMENT, OANDA_TIMEZONE
+from live.config import OANDA_API_BASE, OANDA_INSTRUMENT, OANDA_TIMEZONE, OANDA_CANDLES_TTL
+from live.http_client import SESSION, parse_json
 from live.logging_utils import setup_logger
 
-NY = pytz.timezone(OANDA_TIMEZONE)
+NY = ZoneInfo(OANDA_TIMEZONE)
 logger = setup_logger("data_feed")
 
 
-def _headers():
-    return {
-        "Authorization": f"Bearer {OANDA_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
-
-
-def fetch_m1(count: int = 120, max_retries: int = 3, backoff_seconds: int = 5):
-    """Fetch last `count` M1 candles with retries on transient errors."""
-    url = f"{OANDA_API_BASE}/instruments/{OANDA_INSTRUMENT}/candles"
-    params = {
-        "granularity": "M1",
-        "count": count,
-        "price": "M",
-        "smooth": "true",
-    }
-    last_exception = None
-    for attempt in range(max_retries):
-        try:
-            resp = requests.get(url, headers=_headers(), params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json().get("candles", [])
-            records = []
-            for c in data:
-                # OANDA times can include nanosecond precision; let pandas handle it.
-                ts = pd.to_datetime(c["time"], utc=True).to_pydatetime()
-                mid = c.get("mid", {})
-                records.append({
-                    "time_utc": ts,
-                    "time_ny": ts.astimezone(NY),
-                    "open": float(mid.get("o", 0.0)),
-                    "high": float(mid.get("h", 0.0)),
-                    "low": float(mid.get("l", 0.0)),
-                    "close": float(mid.get("c", 0.0)),
-                    "complete": bool(c.get("complete", False)),
-                })
-            df = pd.DataFrame(records)
-            df = df.sort_values("time_ny").reset_index(drop=True)
-            logger.debug(f"Fetched {len(df)} M1 candles (latest NY {df['time_ny'].iloc[-1] if not df.empty else 'none'})")
-            return df
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {e}. Retrying in {backoff_seconds}s...")
-            time.sleep(backoff_seconds)
-            backoff_seconds *= 2  # Exponential backoff
-    
-    logger.error(f"All {max_retries} attempts failed. Giving up.")
-    raise last_exception
+CANDLE_COLUMNS = ["time_utc", "time_ny", "open", "high", "low", "close", "complete"]
+CANDLES_URL = f"{OANDA_API_BASE}/instruments/{OANDA_INSTRUMENT}/candles"
+
+# Candle GETs retry inside urllib3 (0s, 5s, 10s backoff) on connection errors and
+# throttling/5xx. Mounted on the candles URL prefix, so these requests share the
+# session's auth headers while other OANDA calls keep the default policy.
+CANDLE_RETRY = Retry(total=3, backoff_factor=2.5, status_forcelist=(429, 500, 502, 503, 504),
+                     allowed_methods=("GET",), raise_on_status=False)
+SESSION.mount(CANDLES_URL, HTTPAdapter(pool_maxsize=4, max_retries=CANDLE_RETRY))
+
+# Rolling buffer of recent candles (oldest→newest). Successive polls only
+# request candles from the last buffered bar onward instead of the full `count`.
+# Bars live in preallocated NumPy columns; rows [_head, _tail) are valid and the
+# live window is slid back to the front only when the write cursor hits the end.
+BUFFER_MAX = 1000
+_RING_CAP = 2 * BUFFER_MAX
+OHLC_COLUMNS = ["open", "high", "low", "close"]
+_ring_t = np.empty(_RING_CAP, dtype="datetime64[ns]")  # UTC
+_ring_ohlc = np.empty((_RING_CAP, 4), dtype="float64")
+_ring_complete = np.empty(_RING_CAP, dtype=bool)
+_head = 0
+_tail = 0
+_buffer_lock = Lock()
+_polled_at = None  # time.monotonic() of the last successful candle request
+_polled_minute = None  # wall-clock minute (epoch // 60) of that request
+
+
+def candles_to_frame(data) -> pd.DataFrame:
+    """Build the candle DataFrame column-wise from OANDA's candle JSON list."""
+    if not data:
+        return pd.DataFrame(columns=CANDLE_COLUMNS)
+    times, o, h, l, c, comp = [], [], [], [], [], []
+    for candle in data:
+        mid = candle.get("mid", {})
+        times.append(candle["time"])
+        o.append(mid.get("o", 0.0))
+        h.append(mid.get("h", 0.0))
+        l.append(mid.get("l", 0.0))
+        c.append(mid.get("c", 0.0))
+        comp.append(candle.get("complete", False))
+    # OANDA times can include nanosecond precision; one vectorized parse handles it.
+    time_utc = pd.to_datetime(pd.Series(times), utc=True, format="ISO8601")
+    df = pd.DataFrame({
+        "time_utc": time_utc,
+        "time_ny": time_utc.dt.tz_convert(NY),
+        "open": np.asarray(o, dtype="float64"),
+        "high": np.asarray(h, dtype="float64"),
+        "low": np.asarray(l, dtype="float64"),
+        "close": np.asarray(c, dtype="float64"),
+        "complete": np.asarray(comp, dtype=bool),
+    })
+    # OANDA returns candles oldest→newest; only sort if that ever doesn't hold.
+    if not df["time_utc"].is_monotonic_increasing:
+        df = df.sort_values("time_utc").reset_index(drop=True)
+    return df
+
+
+def _get_candles(params):
+    """One candles request; transient failures were already retried by CANDLE_RETRY."""
+    try:
+        resp = SESSION.get(CANDLES_URL, params=params, timeout=10)
+        resp.raise_for_status()
+        return parse_json(resp).get("candles", [])
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+        logger.error(f"Candle request failed after retries: {e}")
+        raise
+
+
+def _merge_into_buffer(new: pd.DataFrame):
+    """Overwrite any buffered bars at/after the first new bar, then append the new ones.
+    Both sides are time-ordered, so the buffer stays sorted without a re-sort."""
+    global _head, _tail
+    if new.empty:
+        return
+    t = new["time_utc"].values[-BUFFER_MAX:]
+    ohlc = new[OHLC_COLUMNS].to_numpy()[-BUFFER_MAX:]
+    comp = new["complete"].to_numpy()[-BUFFER_MAX:]
+    n = len(t)
+    pos = _head + int(np.searchsorted(_ring_t[_head:_tail], t[0]))
+    if pos + n > _RING_CAP:
+        keep = max(0, min(pos - _head, BUFFER_MAX - n))
+        src = pos - keep
+        _ring_t[:keep] = _ring_t[src:pos]
+        _ring_ohlc[:keep] = _ring_ohlc[src:pos]
+        _ring_complete[:keep] = _ring_complete[src:pos]
+        _head, pos = 0, keep
+    _ring_t[pos:pos + n] = t
+    _ring_ohlc[pos:pos + n] = ohlc
+    _ring_complete[pos:pos + n] = comp
+    _tail = pos + n
+    _head = max(_head, _tail - BUFFER_MAX)
+
+
+def _buffer_frame(count: int) -> pd.DataFrame:
+    """Copy the newest `count` buffered bars out as a candle DataFrame."""
+    lo = max(_head, _tail - count)
+    df = pd.DataFrame(_ring_ohlc[lo:_tail].copy(), columns=OHLC_COLUMNS)
+    time_utc = pd.DatetimeIndex(_ring_t[lo:_tail]).tz_localize("UTC")
+    time_ny = time_utc.tz_convert(NY).rename("time_ny")
+    df.insert(0, "time_utc", time_utc)
+    df.insert(1, "time_ny", time_ny)
+    df["complete"] = _ring_complete[lo:_tail].copy()
+    df.index = time_ny  # callers slice by NY wall-clock time; no re-parse needed
+    return df
+
+
+def fetch_m1(count: int = 120):
+    """Fetch last `count` M1 candles (indexed by tz-aware time_ny); transient errors are retried by CANDLE_RETRY.
+
+    The first call (or one whose window reaches back before the oldest buffered bar,
+    or starts after the newest) pulls the full `count`; later calls only fetch from
+    the last buffered bar, which also refreshes a still-forming candle. A call within
+    OANDA_CANDLES_TTL seconds of the last poll, in the same clock minute, is answered
+    from the buffer without a request.
+    """
+    global _head, _tail, _polled_at, _polled_minute
+    base = {"granularity": "M1", "price": "M", "smooth": "true"}
+    with _buffer_lock:
+        now_minute = int(time.time() // 60)
+        # Start of the requested window: `count` bars ending at the current (forming) minute.
+        # Compared by time, not by bar count, so a window that grows each minute stays incremental.
+        start = np.datetime64((now_minute - count + 1) * 60, "s")
+        incremental = _tail > _head and _ring_t[_head] <= start <= _ring_t[_tail - 1]
+        if (incremental and _polled_at is not None and time.monotonic() - _polled_at < OANDA_CANDLES_TTL
+                and now_minute == _polled_minute):
+            # Polled moments ago within the same minute (no bar can have closed since):
+            # serve the buffer instead of another round trip
+            return _buffer_frame(count)
+        if incremental:
+            last = pd.Timestamp(_ring_t[_tail - 1]).tz_localize("UTC")
+            params = {**base, "from": last.isoformat(), "count": count}
+        else:
+            params = {**base, "count": min(count, BUFFER_MAX)}
+        new = candles_to_frame(_get_candles(params))
+        if incremental and len(new) >= count:
+            # Gap larger than the window (e.g. long downtime): resync with a full fetch.
+            incremental = False
+            params = {**base, "count": min(count, BUFFER_MAX)}
+            new = candles_to_frame(_get_candles(params))
+        if not incremental:
+            _head = _tail = 0
+        _merge_into_buffer(new)
+        _polled_at, _polled_minute = time.monotonic(), int(time.time() // 60)
+        df = _buffer_frame(count)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Fetched %d M1 candles (latest NY %s)", len(df), df["time_ny"].iloc[-1] if not df.empty else "none")
+    return df
+
+
+async def fetch_m1_async(*args, **kwargs):
+    """Awaitable twin of fetch_m1 (worker thread over the pooled SESSION)."""
+    return await asyncio.to_thread(fetch_m1, *args, **kwargs)
 
 
 def latest_slice(df: pd.DataFrame, start_str: str, end_str: str) -> pd.DataFrame:
     """Return rows between start/end (NY local hh:mm)."""
     if df.empty:
         return df
-    df = df.copy()
-    df.index = pd.to_datetime(df["time_ny"])
+    if not isinstance(df.index, pd.DatetimeIndex):
+        # time_ny is already tz-aware (parsed at ingest); set_index returns a new frame
+        df = df.set_index("time_ny", drop=False)
     return df.between_time(start_str, end_str, inclusive="both")
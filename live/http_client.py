@@ -0,0 +1,29 @@
+"""Shared keep-alive HTTP session for OANDA REST calls.
+Reusing one pooled connection avoids a fresh TCP/TLS handshake per request.
+"""
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from live.config import OANDA_API_TOKEN
+
+
+def make_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {OANDA_API_TOKEN}",
+        "Content-Type": "application/json",
+    })
+    retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_json(resp: requests.Response):
+    """Decode a response body with orjson (works on raw bytes, no str decode)."""
+    return orjson.loads(resp.content)
+
+
+SESSION = make_session()
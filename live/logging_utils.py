@@ -12,6 +12,7 @@ LOG_FILE = LOG_DIR / "bot.log"
 LOG_TZ = pytz.timezone(os.getenv("OANDA_TIMEZONE", "America/New_York"))
 FMT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 DATEFMT = "%Y-%m-%d %H:%M:%S %Z"
+LOG_DEBUG = os.getenv("LOG_DEBUG", "false").lower() == "true"  # opt-in per-poll debug records
 
 
 class TZFormatter(logging.Formatter):
@@ -20,31 +21,55 @@ class TZFormatter(logging.Formatter):
     def __init__(self, fmt=None, datefmt=None, tz=None):
         super().__init__(fmt=fmt, datefmt=datefmt)
         self.tz = tz or LOG_TZ
+        self._last = (None, None, None)  # (whole second, datefmt, formatted)
 
     def formatTime(self, record, datefmt=None):
-        dt = datetime.fromtimestamp(record.created, self.tz)
-        if datefmt:
-            return dt.strftime(datefmt)
-        return dt.isoformat()
+        if not datefmt:
+            return datetime.fromtimestamp(record.created, self.tz).isoformat()
+        # datefmt has whole-second resolution: reuse the string for records in the same second.
+        sec = int(record.created)
+        last_sec, last_fmt, last_str = self._last
+        if sec == last_sec and datefmt == last_fmt:
+            return last_str
+        formatted = datetime.fromtimestamp(sec, self.tz).strftime(datefmt)
+        self._last = (sec, datefmt, formatted)
+        return formatted
+
+
+# One shared formatter for every handler on every logger.
+_FORMATTER = TZFormatter(FMT, DATEFMT, tz=LOG_TZ)
 
 
 def setup_logger(name: str = "bot", level=logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
-    logger.setLevel(level)
+    logger.setLevel(logging.DEBUG if LOG_DEBUG else level)
 
     # Console handler
     ch = logging.StreamHandler()
     ch.setLevel(level)
-    ch.setFormatter(TZFormatter(FMT, DATEFMT, tz=LOG_TZ))
+    ch.setFormatter(_FORMATTER)
 
     # Rotating file handler
     fh = RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=5)
     fh.setLevel(logging.DEBUG)
-    fh.setFormatter(TZFormatter(FMT, DATEFMT, tz=LOG_TZ))
+    fh.setFormatter(_FORMATTER)
 
     logger.addHandler(ch)
     logger.addHandler(fh)
     logger.propagate = False
     return logger
+
+
+def setup_file_logger(name: str, path: Path) -> logging.Logger:
+    """Message-only logger appending to `path`; the file is opened on first use and kept open."""
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+    logger.setLevel(logging.INFO)
+    fh = logging.FileHandler(path, mode="a", encoding="utf-8", delay=True)
+    fh.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(fh)
+    logger.propagate = False
+    return logger
@@ -1,8 +1,10 @@
 """Notifier for posting trade updates via Twitter/X API v2 (tweepy Client).
 Logs and skips if credentials are missing.
 """
+import asyncio
 import os
 import io
+import threading
 import tweepy
 from dotenv import load_dotenv
 from live.logging_utils import setup_logger
@@ -16,11 +18,50 @@ ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN", "")
 ACCESS_SECRET = os.getenv("TWITTER_ACCESS_SECRET", "")
 
 
+_HAS_CREDS = all([API_KEY, API_SECRET, ACCESS_TOKEN, ACCESS_SECRET])
+TWEET_MAX_CHARS = 280
+TWEET_MAX_IMAGES = 4  # media attachments per tweet
+
+# Built on first use and reused so the underlying sessions to Twitter stay alive.
+_client = None
+_api_v1 = None
+_clients_lock = threading.Lock()  # notify_trade_async posts from worker threads
+
+
 def can_post() -> bool:
-    ok = all([API_KEY, API_SECRET, ACCESS_TOKEN, ACCESS_SECRET])
-    if not ok:
+    if not _HAS_CREDS:
         logger.info("Notifier: Twitter API creds missing; set TWITTER_* env vars.")
-    return ok
+    return _HAS_CREDS
+
+
+def _get_client() -> tweepy.Client:
+    global _client
+    with _clients_lock:
+        if _client is None:
+            _client = tweepy.Client(
+                consumer_key=API_KEY,
+                consumer_secret=API_SECRET,
+                access_token=ACCESS_TOKEN,
+                access_token_secret=ACCESS_SECRET,
+            )
+        return _client
+
+
+def _get_api_v1() -> tweepy.API:
+    global _api_v1
+    with _clients_lock:
+        if _api_v1 is None:
+            auth = tweepy.OAuth1UserHandler(API_KEY, API_SECRET, ACCESS_TOKEN, ACCESS_SECRET)
+            _api_v1 = tweepy.API(auth)
+        return _api_v1
+
+
+def refresh_clients():
+    """Drop cached clients (e.g. after rotating tokens); they are rebuilt on next post."""
+    global _client, _api_v1
+    with _clients_lock:
+        _client = None
+        _api_v1 = None
 
 
 def notify_trade(message: str, image_buffer=None, images=None):
@@ -28,13 +69,8 @@ def notify_trade(message: str, image_buffer=None, images=None):
         logger.info(f"Notifier: would post (no creds): {message}")
         return {"status": "skipped", "reason": "no_credentials"}
     try:
-        client = tweepy.Client(
-            consumer_key=API_KEY,
-            consumer_secret=API_SECRET,
-            access_token=ACCESS_TOKEN,
-            access_token_secret=ACCESS_SECRET,
-        )
-        
+        client = _get_client()
+
         media_ids = []
         all_images = []
         if image_buffer:
@@ -44,10 +80,11 @@ def notify_trade(message: str, image_buffer=None, images=None):
 
         if all_images:
             # Use v1.1 API for media upload
-            auth = tweepy.OAuth1UserHandler(API_KEY, API_SECRET, ACCESS_TOKEN, ACCESS_SECRET)
-            api = tweepy.API(auth)
+            api = _get_api_v1()
             for i, img in enumerate(all_images):
                 try:
+                    # Charts arrive as PNG bytes; wrap them only for the upload
+                    if isinstance(img, (bytes, bytearray)): img = io.BytesIO(img)
                     if hasattr(img, 'seek'): img.seek(0)
                     media = api.media_upload(filename=f"chart_{i}.png", file=img)
                     media_ids.append(media.media_id)
@@ -59,6 +96,14 @@ def notify_trade(message: str, image_buffer=None, images=None):
             resp = client.create_tweet(text=message, media_ids=media_ids if media_ids else None)
             logger.info("Notifier: tweet posted via v2 client")
             return {"status": "posted", "via": "api", "id": getattr(resp, 'data', {})}
+        except tweepy.Unauthorized:
+            # A cached client can outlive its session; rebuild once and retry.
+            logger.warning("Notifier: 401 from cached client. Rebuilding clients and retrying once...")
+            refresh_clients()
+            client = _get_client()
+            resp = client.create_tweet(text=message, media_ids=media_ids if media_ids else None)
+            logger.info("Notifier: tweet posted via v2 client (after client refresh)")
+            return {"status": "posted", "via": "api", "id": getattr(resp, 'data', {})}
         except Exception as e:
             # If media caused the 403 (common on Free Tier), retry text-only
             if media_ids and "403" in str(e):
@@ -74,3 +119,8 @@ def notify_trade(message: str, image_buffer=None, images=None):
             if len(message) > 280:
                 logger.warning(f"Hint: Message length is {len(message)} chars. Twitter limit is 280.")
         return {"status": "error", "reason": str(e)}
+
+
+async def notify_trade_async(message: str, image_buffer=None, images=None):
+    """Awaitable twin of notify_trade so a post can overlap broker calls."""
+    return await asyncio.to_thread(notify_trade, message, image_buffer=image_buffer, images=images)
@@ -3,28 +3,64 @@ Plotting utilities for trade visualization.
 Generates in-memory images for Twitter/logging.
 """
 import io
+import threading
 import matplotlib
 matplotlib.use("Agg")  # Non-interactive backend for server/docker
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 import pandas as pd
 
+# One Figure/Axes pair is built on first use and cleared between charts,
+# so each chart only pays for the draw pass. The lock serializes callers.
+_FIG = None
+_AX = None
+_LOCK = threading.Lock()
+
+
+def _blank_axes():
+    """Return the shared (fig, ax), cleared and ready to draw on. Call with _LOCK held."""
+    global _FIG, _AX
+    if _FIG is None:
+        # Set a professional style
+        try:
+            plt.style.use('seaborn-v0_8-whitegrid')
+        except OSError:
+            pass # Fallback if style not found
+        # Constrained layout is solved during the single draw pass, unlike
+        # tight_layout + bbox_inches='tight' which each force an extra render.
+        _FIG = Figure(figsize=(10, 6), layout="constrained")
+        _AX = _FIG.add_subplot()
+    _AX.clear()
+    return _FIG, _AX
+
+
+def _render(fig) -> bytes:
+    # Hand back immutable PNG bytes; the BytesIO is released as soon as we return.
+    with io.BytesIO() as buf:
+        # Throwaway preview images: zlib level 1 encodes much faster than the default 6
+        # for a slightly larger file.
+        fig.savefig(buf, format="png", dpi=100, pil_kwargs={"compress_level": 1})
+        return buf.getvalue()
+
 def create_trade_chart(df, trade_date, entry_time, exit_time, 
                        entry_price, exit_price, side, 
                        or_high, or_low, sl, tp, mfe, mae,
                        exit_reason=None):
     """
     Generates a PNG image of the trade session.
-    Returns: io.BytesIO object containing the image.
+    Returns: PNG image bytes.
     """
-    # Set a professional style
-    try:
-        plt.style.use('seaborn-v0_8-whitegrid')
-    except OSError:
-        pass # Fallback if style not found
+    with _LOCK:
+        fig, ax = _blank_axes()
+        return _draw_trade_chart(fig, ax, df, trade_date, entry_time, exit_time,
+                                 entry_price, exit_price, side, or_high, or_low,
+                                 sl, tp, mfe, mae, exit_reason)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
+
+def _draw_trade_chart(fig, ax, df, trade_date, entry_time, exit_time,
+                      entry_price, exit_price, side, or_high, or_low,
+                      sl, tp, mfe, mae, exit_reason):
     # Professional Colors (Flat UI Palette)
     c_price = "#2C3E50"  # Dark Blue-Gray
     c_or    = "#95A5A6"  # Concrete Gray
@@ -72,25 +108,18 @@ def create_trade_chart(df, trade_date, entry_time, exit_time,
     ax.spines['right'].set_visible(False)
     
     # Save to buffer
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png", dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    plt.close(fig)
-    
-    return buf
+    return _render(fig)
 
 def create_or_chart(df, trade_date, or_high, or_low, top_cut, bot_cut):
     """
     Generates a PNG image of the Opening Range formation (09:30-10:00).
     """
-    try:
-        plt.style.use('seaborn-v0_8-whitegrid')
-    except OSError:
-        pass
+    with _LOCK:
+        fig, ax = _blank_axes()
+        return _draw_or_chart(fig, ax, df, trade_date, or_high, or_low, top_cut, bot_cut)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
+
+def _draw_or_chart(fig, ax, df, trade_date, or_high, or_low, top_cut, bot_cut):
     c_price = "#2C3E50"
     c_or    = "#95A5A6"
     
@@ -116,10 +145,4 @@ def create_or_chart(df, trade_date, or_high, or_low, top_cut, bot_cut):
     ax.spines['right'].set_visible(False)
     
     # Save to buffer
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png", dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    plt.close(fig)
-    
-    return buf
+    return _render(fig)
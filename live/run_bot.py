@@ -1,30 +1,44 @@
 """Skeleton live/paper runner.
-- Polls OANDA M1 candles.
+- Polls OANDA M1 candles from an asyncio loop (blocking HTTP runs on worker threads).
 - Builds OR (09:30–10:00 NY), decides at 10:22 using or_core logic.
 - One trade/day, SL/TP attached, hard flat at 12:00.
 - Log-only by default (set PLACE_ORDERS=True to call OANDA).
 """
-import time, os, sys, csv, json
+import asyncio, os, sys, json, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from glob import glob
 from datetime import datetime, timedelta
 import pytz
+import numpy as np
 import pandas as pd
 from pathlib import Path
-ROOT = Path(__file__).resolve().parent.parent
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+if not __package__:
+    # Run as a script (python live/run_bot.py): make the repo root importable.
+    # Imported as live.run_bot or run with -m, the root is already on sys.path.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from live import data_feed, broker_oanda
 from live import notifier, plotting
 from live.config import INSTRUMENTS, STRATEGY, OANDA_TIMEZONE
-from live.logging_utils import setup_logger
+from live.logging_utils import setup_logger, setup_file_logger
 from src import or_core
-from live.trade_types import DailyLog, SessionSetup, SignalDecision, TradeResult
+from live.trade_types import DailyLog, SessionSetup, SignalDecision, TradeResult, ExitResult
 NY = pytz.timezone(OANDA_TIMEZONE)
 logger = setup_logger("bot")
+SUMMARY_DIR = Path(__file__).resolve().parent / "logs" / "summaries"
+summary_logger = setup_file_logger("summary", SUMMARY_DIR / "summary.log")  # one line per trade day
+TRADE_DAY_COLUMNS = (
+    "date", "signals", "orders", "skipped", "errors", "last_signal",
+    "balance_start", "nav_start", "balance_end", "nav_end",
+    "pnl_balance", "pnl_nav", "open_trades_end", "currency",
+)
 PLACE_ORDERS = True  # toggle to True when ready
 POSITION_SIZE = INSTRUMENTS.get("market", {}).get("position_size", 1.0)
 POINT_VAL = INSTRUMENTS.get("market", {}).get("point_value_usd", 80.0)
 REPLAY_FILE = os.getenv("REPLAY_FILE")  # if set, run once on this CSV instead of live polling
 REPLAY_TWEETS = os.getenv("REPLAY_TWEETS", "false").lower() == "true"
+REPLAY_DIR = os.getenv("REPLAY_DIR")  # if set, replay every CSV in this folder in parallel (no tweets)
+REPLAY_GLOB = os.getenv("REPLAY_GLOB")  # same, for a glob of CSVs (e.g. data/raw/replay_2025-11-*.csv)
 
 OR_START = INSTRUMENTS.get("session", {}).get("or_window", {}).get("start", "09:30")
 OR_END   = INSTRUMENTS.get("session", {}).get("or_window", {}).get("end_inclusive", "10:00")
@@ -35,11 +49,28 @@ BOT_PCT  = STRATEGY.get("parameters", {}).get("zones", {}).get("bottom_pct", 0.3
 SL_PTS   = STRATEGY.get("parameters", {}).get("risk", {}).get("stop_loss_points", 25)
 TP_PTS   = STRATEGY.get("parameters", {}).get("risk", {}).get("take_profit_points", 75)
 OR_INCOMPLETE_TOLERANCE = 2  # How many missing candles to tolerate in OR window before skipping.
+_or_cache = {}  # trade_date -> or_levels(...) once the OR window is validated; it cannot change afterwards
+NOTIFY_QUEUE_MAX = 32  # pending alerts before new ones are dropped (notifier down / rate-limited)
+_notify_q = asyncio.Queue(maxsize=NOTIFY_QUEUE_MAX)
+KEEPALIVE_SECONDS = 60  # ping OANDA this often during the session so orders reuse a warm connection
 
 OR_START_T = pd.Timestamp(OR_START).time()
 OR_END_T = pd.Timestamp(OR_END).time()
 ENTRY_T_T = pd.Timestamp(ENTRY_T).time()
 EXIT_T_T = pd.Timestamp(EXIT_T).time()
+# Same times as integer minutes since midnight, for cheap int compares in the loop
+OR_START_MOD = OR_START_T.hour * 60 + OR_START_T.minute
+OR_END_MOD = OR_END_T.hour * 60 + OR_END_T.minute
+ENTRY_MOD = ENTRY_T_T.hour * 60 + ENTRY_T_T.minute
+EXIT_MOD = EXIT_T_T.hour * 60 + EXIT_T_T.minute
+WAKE_T = (datetime.combine(datetime.min, OR_START_T) - timedelta(minutes=1)).time()
+WAKE_MOD = OR_START_MOD - 1
+OR_EXPECTED_ROWS = OR_END_MOD - OR_START_MOD + 1
+FETCH_PAD_BARS = 5  # extra bars per poll so the OR start is covered even if the feed lags
+ENTRY_CLOSE_DELAY = timedelta(minutes=1)  # the entry candle is final once the next minute starts
+MISSING_ENTRY_GRACE = timedelta(minutes=5)  # feed latency allowance before skipping a missing entry bar
+HEARTBEAT_SESSION = timedelta(minutes=10)
+HEARTBEAT_IDLE = timedelta(hours=1)
 
 
 class DateTimeEncoder(json.JSONEncoder):
@@ -54,104 +85,216 @@ def now_ny():
     return datetime.now(tz=NY)
 
 
+def minute_now(ny_now: datetime) -> int:
+    """Minutes since midnight for a wall-clock time (compare against the *_MOD constants)."""
+    return ny_now.hour * 60 + ny_now.minute
+
+
+def next_wakeup(ny_now: datetime) -> datetime:
+    """Next weekday WAKE_T (one minute before the OR opens) strictly after ny_now."""
+    day = ny_now.date()
+    if ny_now.weekday() >= 5 or minute_now(ny_now) >= WAKE_MOD:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return NY.localize(datetime.combine(day, WAKE_T))
+
+
+def session_bar_count(now_m: int) -> int:
+    """Bars needed to cover today's session so far (OR start -> now) plus a small pad."""
+    return max(now_m - OR_START_MOD + 1, 0) + FETCH_PAD_BARS
+
+
+@lru_cache(maxsize=16)
+def session_dt(trade_date, t) -> datetime:
+    """tz-aware NY datetime of session time `t` on trade_date, localized once per day."""
+    return NY.localize(datetime.combine(trade_date, t))
+
+
+def next_session_event(ny_now: datetime, trade_date, *extra: datetime) -> datetime:
+    """Earliest of today's OR start, OR-end-bar close and entry-bar close (plus `extra`) after ny_now."""
+    events = [session_dt(trade_date, OR_START_T)]
+    events += [session_dt(trade_date, t) + ENTRY_CLOSE_DELAY for t in (OR_END_T, ENTRY_T_T)]
+    return min(t for t in (*events, *extra) if t > ny_now)
+
+
+async def sleep_until(target: datetime):
+    await asyncio.sleep(max(1.0, (target - now_ny()).total_seconds()))
+
+
+ENV_SHORT = "Live" if "fxtrade" in broker_oanda.OANDA_API_BASE else "Practice"
+
+
 def format_session_overview() -> str:
     """Human-friendly summary of the configured session for logs/alerts."""
-    env_short = "Live" if "fxtrade" in broker_oanda.OANDA_API_BASE else "Practice"
     return (
         f"Session OR {OR_START}-{OR_END} NY, entry {ENTRY_T}, exit {EXIT_T}; "
-        f"inst={broker_oanda.OANDA_INSTRUMENT} env={env_short}; "
+        f"inst={broker_oanda.OANDA_INSTRUMENT} env={ENV_SHORT}; "
         f"size={POSITION_SIZE} pt_val=${POINT_VAL:.2f}; "
         f"zones {TOP_PCT:.2f}/{BOT_PCT:.2f} SL={SL_PTS} TP={TP_PTS}; "
         f"orders={'ON' if PLACE_ORDERS else 'OFF'}"
     )
 
 
-def compute_signal(win_df: pd.DataFrame, or_df: pd.DataFrame):
-    # replicate or_core decision using latest dataframes
-    or_high = or_df["high"].max(); or_low = or_df["low"].min()
+SESSION_OVERVIEW = format_session_overview()  # config is fixed for the process lifetime
+
+
+def minute_of_day(idx: pd.DatetimeIndex) -> np.ndarray:
+    """Integer minutes since midnight for each bar (vectorized, no datetime.time objects)."""
+    return np.asarray(idx.hour * 60 + idx.minute)
+
+
+def bar_at(mod: np.ndarray, minute: int):
+    """Position of the bar stamped `minute` in a sorted minute-of-day array, or None."""
+    i = int(np.searchsorted(mod, minute))
+    return i if i < len(mod) and mod[i] == minute else None
+
+
+def or_window(win_df: pd.DataFrame, mod: np.ndarray) -> pd.DataFrame:
+    """OR bars as the leading rows of the (time-sorted) session window; no second slice."""
+    return win_df.iloc[:int(np.searchsorted(mod, OR_END_MOD, side="right"))]
+
+
+def or_closed(or_df: pd.DataFrame) -> bool:
+    """True once the last OR bar is final (the OR_END bar keeps forming until OR_END + 1 min)."""
+    return or_df.empty or "complete" not in or_df.columns or bool(or_df["complete"].to_numpy()[-1])
+
+
+def or_levels(or_df: pd.DataFrame, top_pct: float = TOP_PCT, bot_pct: float = BOT_PCT):
+    """OR high/low/range and the long/short cut levels for a completed OR slice."""
+    return cut_levels(float(or_df["high"].to_numpy().max()), float(or_df["low"].to_numpy().min()), top_pct, bot_pct)
+
+
+def cut_levels(or_high: float, or_low: float, top_pct: float = TOP_PCT, bot_pct: float = BOT_PCT):
     or_rng = or_high - or_low
-    bottom_cut = or_low + BOT_PCT * or_rng
-    top_cut    = or_high - TOP_PCT * or_rng
-    
-    e_rows = win_df.loc[win_df.index.time == ENTRY_T_T]
-    if e_rows.empty:
-        return None, "missing_entry"
-    # Ensure parity with historical data: only trade on completed candles
-    if "complete" in e_rows.columns and not e_rows.iloc[0]["complete"]:
-        return None, "entry_incomplete"
-    entry = float(e_rows.iloc[0]["close"])
+    top_cut    = or_high - top_pct * or_rng
+    bottom_cut = or_low + bot_pct * or_rng
+    return or_high, or_low, or_rng, top_cut, bottom_cut
+
+
+def decide(entry: float, top_cut: float, bottom_cut: float, sl_pts: float = SL_PTS, tp_pts: float = TP_PTS):
+    """Pure-float signal rule. Parameter sweeps can call it directly with their own
+    cuts/SL/TP without going through DataFrames or the module-level config."""
     if entry >= top_cut:
-        return ("long", entry, entry - SL_PTS, entry + TP_PTS), "long"
+        return ("long", entry, entry - sl_pts, entry + tp_pts), "long"
     elif entry <= bottom_cut:
-        return ("short", entry, entry + SL_PTS, entry - TP_PTS), "short"
+        return ("short", entry, entry + sl_pts, entry - tp_pts), "short"
     return None, "none"
 
 
-def simulate_exit(win_df: pd.DataFrame, side: str, entry: float, sl: float, tp: float):
-    """Walk bars after entry to find TP/SL/time exit (similar to execute_day)."""
-    path = win_df.loc[win_df.index.time > ENTRY_T_T].copy()
-    exit_ts = None
+def compute_signal(win_df: pd.DataFrame, or_df: pd.DataFrame = None, levels=None, mod: np.ndarray = None):
+    # replicate or_core decision using latest dataframes (or precomputed OR levels)
+    _, _, _, top_cut, bottom_cut = levels if levels is not None else or_levels(or_df)
+
+    # The window is sorted by time, so the entry bar can be found by bisection
+    if mod is None:
+        mod = minute_of_day(win_df.index)
+    i = bar_at(mod, ENTRY_MOD)
+    if i is None:
+        return None, "missing_entry"
+    # Ensure parity with historical data: only trade on completed candles
+    if "complete" in win_df.columns and not win_df["complete"].to_numpy()[i]:
+        return None, "entry_incomplete"
+    entry = float(win_df["close"].to_numpy()[i])
+    return decide(entry, top_cut, bottom_cut)
+
+
+def side_sign(side: str) -> float:
+    """+1.0 for a long, -1.0 for a short: multiplies a price move into P&L terms."""
+    return 1.0 if side == "long" else -1.0
+
+
+def exit_on_path(hi: np.ndarray, lo: np.ndarray, close: np.ndarray, side: str, entry: float, sl: float, tp: float):
+    """Array core of simulate_exit over the bars after entry.
+    Returns (exit_i, exit_px, exit_reason, mfe, mae); exit_i is None for an empty path."""
+    n = len(hi)
+    exit_i = None
     exit_px = None
     exit_reason = None
 
-    if side == "long":
-        for ts, row in path.iterrows():
-            hi, lo = float(row["high"]), float(row["low"])
-            touched_tp = hi >= tp
-            touched_sl = lo <= sl
-            if touched_tp and touched_sl:
-                exit_ts, exit_px, exit_reason = ts, sl, "sl"; break
-            elif touched_sl:
-                exit_ts, exit_px, exit_reason = ts, sl, "sl"; break
-            elif touched_tp:
-                exit_ts, exit_px, exit_reason = ts, tp, "tp"; break
-    elif side == "short":
-        for ts, row in path.iterrows():
-            hi, lo = float(row["high"]), float(row["low"])
-            touched_tp = lo <= tp
-            touched_sl = hi >= sl
-            if touched_tp and touched_sl:
-                exit_ts, exit_px, exit_reason = ts, sl, "sl"; break
-            elif touched_sl:
-                exit_ts, exit_px, exit_reason = ts, sl, "sl"; break
-            elif touched_tp:
-                exit_ts, exit_px, exit_reason = ts, tp, "tp"; break
-
-    if exit_ts is None:
-        if not path.empty:
-            exit_ts = path.index.max()
-            exit_px = float(path.loc[exit_ts, "close"])
-            exit_reason = "time"
-    
-    # Calculate MFE/MAE
-    if exit_ts:
-        trade_path = path.loc[:exit_ts]
-    else:
-        trade_path = path
-    
+    if side in ("long", "short"):
+        i, hit = or_core.first_exit(hi, lo, sl, tp, is_long=(side == "long"))
+        if hit is not None:
+            exit_i, exit_px, exit_reason = i, (sl if hit == "sl" else tp), hit
+
+    if exit_i is None and n:
+        exit_i = n - 1
+        exit_px = float(close[exit_i])
+        exit_reason = "time"
+
+    # Calculate MFE/MAE over the bars up to and including the exit bar; in signed
+    # space (s=+1 long, -1 short) the favourable side is hi for longs and lo for shorts
+    end = exit_i + 1 if exit_i is not None else n
     mfe, mae = 0.0, 0.0
-    if not trade_path.empty:
-        if side == "long":
-            mfe = trade_path["high"].max() - entry
-            mae = entry - trade_path["low"].min()
-        else:
-            mfe = entry - trade_path["low"].min()
-            mae = trade_path["high"].max() - entry
-
-    pnl_pts = None
-    pnl_usd = None
-    if exit_px is not None:
-        pnl_pts = float(exit_px - entry) if side == "long" else float(entry - exit_px)
-        pnl_usd = pnl_pts * POINT_VAL * POSITION_SIZE
-    return {
-        "exit_ts": exit_ts,
-        "exit_px": exit_px,
-        "exit_reason": exit_reason,
-        "pnl_pts": pnl_pts,
-        "pnl_usd": pnl_usd,
-        "mfe": mfe,
-        "mae": mae,
-    }
+    if end:
+        s = side_sign(side)
+        fav, adv = (hi[:end], lo[:end]) if s > 0 else (lo[:end], hi[:end])
+        mfe = (s * (fav - entry)).max()
+        mae = (s * (entry - adv)).max()
+    return exit_i, exit_px, exit_reason, mfe, mae
+
+
+def trade_pnl(side: str, entry: float, exit_px):
+    """(pnl_pts, pnl_usd) for a closed trade, or (None, None) without an exit price."""
+    if exit_px is None:
+        return None, None
+    pnl_pts = float(side_sign(side) * (exit_px - entry))
+    return pnl_pts, pnl_pts * POINT_VAL * POSITION_SIZE
+
+
+def simulate_exit(win_df: pd.DataFrame, side: str, entry: float, sl: float, tp: float, mod: np.ndarray = None):
+    """Find the first bar after entry that hits TP/SL, else exit on time (same scan as execute_day)."""
+    if mod is None:
+        mod = minute_of_day(win_df.index)
+    path = win_df.iloc[int(np.searchsorted(mod, ENTRY_MOD, side="right")):]
+    exit_i, exit_px, exit_reason, mfe, mae = exit_on_path(
+        path["high"].to_numpy(dtype="float64"), path["low"].to_numpy(dtype="float64"),
+        path["close"].to_numpy(dtype="float64"), side, entry, sl, tp,
+    )
+    pnl_pts, pnl_usd = trade_pnl(side, entry, exit_px)
+    return ExitResult(
+        exit_ts=path.index[exit_i] if exit_i is not None else None,
+        exit_px=exit_px,
+        exit_reason=exit_reason,
+        pnl_pts=pnl_pts,
+        pnl_usd=pnl_usd,
+        mfe=mfe,
+        mae=mae,
+    )
+
+
+def replay_day(mod: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, complete: np.ndarray = None) -> dict:
+    """Whole-day decision on flat arrays of one (time-sorted) session window: OR levels,
+    entry bar, signal and exit in one pass with no DataFrame access. Same rules as
+    compute_signal + simulate_exit; exit_i is a position in the window."""
+    if not len(mod):
+        return {"decision": "no_data", "or_rows": 0}
+    n_or = int(np.searchsorted(mod, OR_END_MOD, side="right"))
+    if n_or != OR_EXPECTED_ROWS:
+        return {"decision": "or_incomplete", "or_rows": n_or}
+    or_high, or_low, or_rng, top_cut, bottom_cut = cut_levels(float(high[:n_or].max()), float(low[:n_or].min()))
+    day = {"decision": None, "or_rows": n_or, "or_high": or_high, "or_low": or_low,
+           "or_rng": or_rng, "top_cut": top_cut, "bottom_cut": bottom_cut}
+
+    i = bar_at(mod, ENTRY_MOD)
+    if i is None:
+        day["decision"] = "missing_entry"
+        return day
+    if complete is not None and not complete[i]:
+        day["decision"] = "entry_incomplete"
+        return day
+    sig, day["decision"] = decide(float(close[i]), top_cut, bottom_cut)
+    if sig is None:
+        return day
+
+    side, entry, sl, tp = sig
+    start = int(np.searchsorted(mod, ENTRY_MOD, side="right"))
+    exit_i, exit_px, exit_reason, mfe, mae = exit_on_path(high[start:], low[start:], close[start:], side, entry, sl, tp)
+    pnl_pts, pnl_usd = trade_pnl(side, entry, exit_px)
+    day.update(side=side, entry=entry, sl=sl, tp=tp,
+               exit_i=start + exit_i if exit_i is not None else None, exit_reason=exit_reason,
+               exit_px=exit_px, pnl_pts=pnl_pts, pnl_usd=pnl_usd, mfe=mfe, mae=mae)
+    return day
 
 
 def check_or_completeness(slice_or, or_expected_rows, trade_date, or_start, or_end, tolerance, ny_timezone):
@@ -195,27 +338,131 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> float:
     tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
     return tr.rolling(period).mean().iloc[-1]
 
-def main_loop():
+async def close_and_fetch(count: int = 400):
+    """Close all trades and pull candles for post-trade stats concurrently.
+    A fetch failure is returned (not raised) so it can't mask the close result."""
+    closed, df_post = await asyncio.gather(
+        broker_oanda.close_all_trades_async(),
+        data_feed.fetch_m1_async(count=count),
+        return_exceptions=True,
+    )
+    if isinstance(closed, BaseException):
+        raise closed
+    return closed, df_post
+
+def notify(message: str, image_buffer=None, images=None):
+    """Queue an alert for notify_worker; never blocks the trading loop on the notifier."""
+    try:
+        _notify_q.put_nowait((message, image_buffer, images))
+    except asyncio.QueueFull:
+        logger.warning("Notifier backlog full; dropping alert: %s", message.splitlines()[0][:80])
+
+def _alert_images(image_buffer, images) -> list:
+    return ([image_buffer] if image_buffer else []) + list(images or [])
+
+async def notify_worker():
+    """Drain queued alerts in order; alerts already waiting are coalesced into one post while they fit a tweet."""
+    carry = None  # alert taken off the queue that did not fit the previous post
+    while True:
+        message, image_buffer, images = carry or await _notify_q.get()
+        imgs = _alert_images(image_buffer, images)
+        taken, carry = 1, None
+        while not _notify_q.empty():
+            nxt = _notify_q.get_nowait()
+            nxt_imgs = _alert_images(nxt[1], nxt[2])
+            merged = f"{message}\n\n{nxt[0]}"
+            if len(merged) > notifier.TWEET_MAX_CHARS or len(imgs) + len(nxt_imgs) > notifier.TWEET_MAX_IMAGES:
+                carry = nxt
+                break
+            message, imgs, taken = merged, imgs + nxt_imgs, taken + 1
+        try:
+            await notifier.notify_trade_async(message, images=imgs or None)
+        except Exception:
+            logger.exception("Notifier error while posting queued alert")
+        finally:
+            for _ in range(taken):
+                _notify_q.task_done()
+
+async def after_fill(trade_msg: str):
+    """Queue the trade alert and refresh the account snapshot without waiting on the notifier."""
+    notify(trade_msg)
+    try:
+        acct = await broker_oanda.get_account_summary_async()
+    except Exception:
+        logger.exception("Could not refresh account summary after fill")
+        return
+    logger.info(
+        "POST_FILL_ACCOUNT nav=%.2f margin_used=%.2f margin_avail=%.2f open_trades=%s",
+        acct["nav"], acct["margin_used"], acct["margin_available"], acct["open_trade_count"],
+    )
+
+async def heartbeat_open_trades() -> list:
+    """Open trades for the heartbeat line, read fresh so the count reflects broker-side closes;
+    a failure is logged, never raised."""
+    try:
+        return await broker_oanda.get_open_trades_async(fresh=True)
+    except Exception:
+        logger.exception("Heartbeat: failed to fetch open trades")
+        return []
+
+async def keep_alive():
+    """Ping OANDA on a fixed cadence while the session is live (weekdays, OR start → exit)
+    so the pooled TLS connection is warm when the entry order goes out."""
+    while True:
+        await asyncio.sleep(KEEPALIVE_SECONDS)
+        ny_now = now_ny()
+        if ny_now.weekday() >= 5 or not (OR_START_MOD <= minute_now(ny_now) <= EXIT_MOD):
+            continue
+        try:
+            await broker_oanda.ping_async()
+        except Exception as e:
+            logger.debug("Keep-alive ping failed: %s", e)
+
+def save_day_state(path: Path, state: dict):
+    """Atomically rewrite the restart-state file (temp file + os.replace)."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, cls=DateTimeEncoder)
+    os.replace(tmp, path)
+
+
+def load_day_state(path: Path, day) -> dict:
+    """Saved state for `day`, or None if the file is missing or from another day."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    return state if state.get("date") == str(day) else None
+
+
+async def main_loop():
     last_trade_date = None
     last_heartbeat_at = None
     summary = {"signals": 0, "orders": 0, "skipped": 0, "errors": 0, "last_signal": None}
-    summary_path = Path(__file__).resolve().parent / "logs" / "summaries"
+    summary_path = SUMMARY_DIR
     summary_path.mkdir(parents=True, exist_ok=True)
-    trade_log_path = summary_path / "trade_days.csv"
+    json_dir = summary_path / "daily_json"
+    json_dir.mkdir(exist_ok=True)
+    # One row per trade day, so keep the handle for the process lifetime (flushed per row)
+    trade_log = open(summary_path / "trade_days.csv", "a", newline="", encoding="utf-8")
+    if trade_log.tell() == 0:
+        trade_log.write(",".join(TRADE_DAY_COLUMNS) + "\r\n")
+        trade_log.flush()
     summary_flushed_for = None
     or_announced_for = None
     session_announced_for = None
     daily_details: Optional[DailyLog] = {}
     start_account_snapshot = None
-    or_expected_rows = len(pd.date_range(pd.Timestamp(OR_START), pd.Timestamp(OR_END), freq="min"))
-    skipped_days = {}
+    skipped_days = {}  # trade_date.toordinal() -> skip reason
     session_started_for = None
-    handled_days = set()
+    handled_days = set()  # trade_date.toordinal()
 
     # RECOVERY: Attempt to load existing daily_details if restarting mid-day
+    today = now_ny().date()
     try:
-        today_str = str(now_ny().date())
-        json_rec_path = summary_path / "daily_json" / f"{today_str}.json"
+        today_str = str(today)
+        json_rec_path = json_dir / f"{today_str}.json"
         if json_rec_path.exists():
             with open(json_rec_path, "r") as f:
                 daily_details = json.load(f)
@@ -223,153 +470,168 @@ def main_loop():
     except Exception as e:
         logger.warning(f"Could not recover existing JSON log: {e}")
 
+    # A day already decided before a restart must not be traded (or recapped) twice
+    state_path = summary_path / "state.json"
+    try:
+        state = load_day_state(state_path, today)
+        if state:
+            last_trade_date = today
+            summary = state["summary"]
+            # State is only saved once the day is decided (skip, no trade or trade)
+            handled_days.add(today.toordinal())
+            if state.get("skip_reason"):
+                skipped_days[today.toordinal()] = state["skip_reason"]
+            if state.get("flushed"):
+                summary_flushed_for = today
+            logger.info(f"Recovered trade-day state for {today}: {summary}")
+    except Exception as e:
+        logger.warning(f"Could not recover trade-day state: {e}")
+    saved_state_sig = (last_trade_date, len(handled_days), summary_flushed_for, tuple(summary.values()))
+
+    def skip_day(trade_date, reason: str, log_msg: str, alert: str = None):
+        """Record `reason` as the day's skip (once), log/alert it and mark the day handled."""
+        nonlocal last_trade_date
+        trade_ord = trade_date.toordinal()
+        if trade_ord in skipped_days:
+            return
+        skipped_days[trade_ord] = reason
+        summary["skipped"] += 1
+        logger.warning(log_msg)
+        try:
+            if alert:
+                notify(alert)
+        except Exception:
+            logger.exception("Notifier error while posting skip day alert")
+        handled_days.add(trade_ord)
+        last_trade_date = trade_date
+
     # Pre-open status
     try:
-        overview = format_session_overview()
-        logger.info(f"STARTUP {overview}")
-        notifier.notify_trade(f"Bot ready: {overview}")
+        logger.info(f"STARTUP {SESSION_OVERVIEW}")
+        notify(f"Bot ready: {SESSION_OVERVIEW}")
     except Exception:
         logger.exception("Notifier error while posting pre-open status")
+    keep_alive_task = asyncio.create_task(keep_alive())  # keep a reference so it is not GC'd
+    notify_task = asyncio.create_task(notify_worker())
     while True:
         try:
             fetch_latency_ms = None
             ny_now = now_ny()
-            if ny_now.weekday() >= 5:  # skip weekends
-                time.sleep(60); continue
+            now_m = minute_now(ny_now)
+            if ny_now.weekday() >= 5 or now_m < WAKE_MOD:  # weekends / overnight
+                await sleep_until(next_wakeup(ny_now)); continue
 
-            in_session_window = OR_START_T <= ny_now.time() <= EXIT_T_T
+            in_session_window = OR_START_MOD <= now_m <= EXIT_MOD
             if in_session_window and session_announced_for != ny_now.date():
-                logger.info(f"SESSION_START {format_session_overview()}")
+                logger.info(f"SESSION_START {SESSION_OVERVIEW}")
                 session_announced_for = ny_now.date()
                 try:
-                    # If the bot restarted mid-session, ensure we are flat
-                    open_trades = broker_oanda.get_open_trades()
+                    # One account request gives both the start snapshot and the open trades
+                    start_account_snapshot, open_trades = await broker_oanda.get_account_full_async()
                     if open_trades:
+                        # If the bot restarted mid-session, ensure we are flat
                         logger.warning(f"Found {len(open_trades)} open trades at session start; closing them.")
-                        broker_oanda.close_all_trades()
-                    start_account_snapshot = broker_oanda.get_account_summary()
+                        await broker_oanda.close_all_trades_async()
+                        start_account_snapshot = await broker_oanda.get_account_summary_async()
                     session_started_for = ny_now.date()
                     logger.info(
-                        "SESSION_ACCOUNT_START "
-                        f"balance={start_account_snapshot['balance']:.2f} "
-                        f"nav={start_account_snapshot['nav']:.2f} "
-                        f"utpl={start_account_snapshot['unrealized_pl']:.2f} "
-                        f"open_trades={start_account_snapshot['open_trade_count']} "
-                        f"ccy={start_account_snapshot['currency']}"
+                        "SESSION_ACCOUNT_START balance=%.2f nav=%.2f utpl=%.2f open_trades=%s ccy=%s",
+                        start_account_snapshot["balance"], start_account_snapshot["nav"],
+                        start_account_snapshot["unrealized_pl"], start_account_snapshot["open_trade_count"],
+                        start_account_snapshot["currency"],
                     )
-                    notifier.notify_trade(f"Session live: {format_session_overview()}")
+                    notify(f"Session live: {SESSION_OVERVIEW}")
                 except Exception:
                     logger.exception("Could not fetch account summary at session start")
 
-            fetch_started = datetime.utcnow()
-            df = data_feed.fetch_m1(count=600)
-            fetch_latency_ms = int((datetime.utcnow() - fetch_started).total_seconds() * 1000)
-            slice_win = data_feed.latest_slice(df, OR_START, EXIT_T)
-            slice_or  = data_feed.latest_slice(df, OR_START, OR_END)
-
-            # ensure indexes are time-aware for selection
-            slice_win = slice_win.copy(); slice_or = slice_or.copy()
-            slice_win.index = pd.to_datetime(slice_win["time_ny"])
-            slice_or.index  = pd.to_datetime(slice_or["time_ny"])
-
             trade_date = ny_now.date()
-            if trade_date in skipped_days or trade_date in handled_days:
-                # Already decided to skip/handle this trade day; keep heartbeats only.
-                time.sleep(60); continue
+            trade_ord = trade_date.toordinal()  # int key for the per-day skip/handled lookups
+            if trade_ord in skipped_days or trade_ord in handled_days:
+                # Already decided to skip/handle this trade day. Wake once at the hard exit so
+                # the daily summary is flushed, then sleep through to the next session.
+                exit_dt = session_dt(trade_date, EXIT_T_T)
+                await sleep_until(exit_dt if ny_now < exit_dt else next_wakeup(ny_now)); continue
+            if now_m < OR_START_MOD:  # nothing to fetch before the first OR bar
+                await sleep_until(session_dt(trade_date, OR_START_T)); continue
 
             # Heartbeat cadence: 10m during session window, hourly otherwise
-            hb_interval = timedelta(minutes=10) if in_session_window else timedelta(hours=1)
-            if (not last_heartbeat_at) or (ny_now - last_heartbeat_at >= hb_interval):
-                hb_open_trades = []
-                try:
-                    hb_open_trades = broker_oanda.get_open_trades()
-                except Exception:
-                    logger.exception("Heartbeat: failed to fetch open trades")
+            hb_interval = HEARTBEAT_SESSION if in_session_window else HEARTBEAT_IDLE
+            hb_due = (not last_heartbeat_at) or (ny_now - last_heartbeat_at >= hb_interval)
+
+            # The heartbeat's open-trades call overlaps the candle fetch instead of following it
+            fetch_started = time.monotonic_ns()
+            fetch = data_feed.fetch_m1_async(count=session_bar_count(now_m))
+            if hb_due:
+                df, hb_open_trades = await asyncio.gather(fetch, heartbeat_open_trades())
+            else:
+                df = await fetch
+            fetch_latency_ms = (time.monotonic_ns() - fetch_started) // 1_000_000
+            levels = _or_cache.get(trade_date)
+            slice_win = data_feed.latest_slice(df, OR_START, EXIT_T)
+            win_mod = minute_of_day(slice_win.index)
+            slice_or  = or_window(slice_win, win_mod) if levels is None else None
+
+            if hb_due:
                 last_ts = slice_win.index.max() if not slice_win.empty else None
                 last_px = float(slice_win.loc[last_ts, "close"]) if last_ts is not None else None
                 logger.info(
-                    f"HEARTBEAT alive latency_ms={fetch_latency_ms} "
-                    f"last_bar={last_ts} last_px={last_px} open_trades={len(hb_open_trades)}"
+                    "HEARTBEAT alive latency_ms=%s last_bar=%s last_px=%s open_trades=%d",
+                    fetch_latency_ms, last_ts, last_px, len(hb_open_trades),
                 )
                 last_heartbeat_at = ny_now
 
-            has_entry = any(slice_win.index.time == ENTRY_T_T)
-            has_exit  = any(slice_win.index.time == EXIT_T_T)
+            has_entry = bar_at(win_mod, ENTRY_MOD) is not None
+            has_exit  = bar_at(win_mod, EXIT_MOD) is not None
             
             # Wait until the entry candle is fully closed (ENTRY_T + 1 minute)
             # e.g. if Entry is 10:22, we wait until 10:23:00 to ensure we have the final close.
-            entry_wait_dt = NY.localize(datetime.combine(trade_date, ENTRY_T_T)) + timedelta(minutes=1)
+            entry_wait_dt = session_dt(trade_date, ENTRY_T_T) + ENTRY_CLOSE_DELAY
             
             if last_trade_date == trade_date:
-                time.sleep(30); continue
+                await asyncio.sleep(30); continue
 
             # Safety: Don't enter trades if the session is already over (e.g. late start)
-            if ny_now.time() >= EXIT_T_T:
+            if now_m >= EXIT_MOD:
                 # Safety: Ensure any lingering trades are closed if we wake up past exit time
                 try:
-                    if broker_oanda.get_open_trades():
+                    if await broker_oanda.get_open_trades_async(fresh=True):
                         logger.warning("Found open trades past hard exit time. Closing all.")
-                        broker_oanda.close_all_trades()
-                        notifier.notify_trade("WARNING: Closed lingering trades found past hard exit.")
+                        await broker_oanda.close_all_trades_async()
+                        notify("WARNING: Closed lingering trades found past hard exit.")
                 except Exception:
                     logger.exception("Failed to check/close trades in safety block")
 
                 msg = f"Current time {ny_now.strftime('%H:%M')} is past hard exit {EXIT_T}. Skipping trade entry."
-                logger.warning(msg)
-                try:
-                    notifier.notify_trade(f"WARNING: {msg}")
-                except Exception:
-                    logger.exception("Notifier error while posting skip day alert")
-                last_trade_date = trade_date
-                summary["skipped"] += 1
-                handled_days.add(trade_date)
-                time.sleep(60)
+                skip_day(trade_date, "past_exit", msg, f"WARNING: {msg}")
+                await asyncio.sleep(60)
                 continue
 
             # Check for missing entry bar only after a buffer (e.g. 5 mins) to allow for latency/retries
-            if ny_now > (entry_wait_dt + timedelta(minutes=5)) and not has_entry:
-                if trade_date not in skipped_days:
-                    skipped_days[trade_date] = "missing_entry_bar"
-                    summary["skipped"] += 1
-                    msg = f"Skipping day (missing entry bar {ENTRY_T} after 5m wait)"
-                    logger.warning(msg)
-                    try:
-                        notifier.notify_trade(f"WARNING: {msg}")
-                    except Exception:
-                        logger.exception("Notifier error while posting skip day alert")
-                    handled_days.add(trade_date)
-                    last_trade_date = trade_date
-                time.sleep(60); continue
-
-            if ny_now.time() >= EXIT_T_T and not has_exit:
-                if trade_date not in skipped_days:
-                    skipped_days[trade_date] = "missing_exit_bar"
-                    summary["skipped"] += 1
-                    msg = f"Skipping day (missing exit bar {EXIT_T})"
-                    logger.warning(msg)
-                    try:
-                        notifier.notify_trade(f"WARNING: {msg}")
-                    except Exception:
-                        logger.exception("Notifier error while posting skip day alert")
-                    handled_days.add(trade_date)
-                    last_trade_date = trade_date
-                time.sleep(60); continue
-
-            # OR completeness / zero-range guard
-            if ny_now.time() >= OR_END_T:
-                if trade_date not in skipped_days:
+            if ny_now > (entry_wait_dt + MISSING_ENTRY_GRACE) and not has_entry:
+                msg = f"Skipping day (missing entry bar {ENTRY_T} after 5m wait)"
+                skip_day(trade_date, "missing_entry_bar", msg, f"WARNING: {msg}")
+                await asyncio.sleep(60); continue
+
+            if now_m >= EXIT_MOD and not has_exit:
+                msg = f"Skipping day (missing exit bar {EXIT_T})"
+                skip_day(trade_date, "missing_exit_bar", msg, f"WARNING: {msg}")
+                await asyncio.sleep(60); continue
+
+            # OR completeness / zero-range guard (once per day; the levels are cached after).
+            # Only after the OR_END bar has closed, so a still-forming bar is never cached.
+            if now_m > OR_END_MOD and levels is None:
+                if trade_ord not in skipped_days:
                     # Retry loop for fetching OR data
                     or_slice_is_complete = False
                     for i in range(3):  # 3 attempts
                         # On attempt > 1, re-fetch data. Otherwise, use data from main loop fetch.
                         if i > 0:
-                            df = data_feed.fetch_m1(count=600)
+                            df = await data_feed.fetch_m1_async(count=session_bar_count(minute_now(now_ny())))
                             slice_win = data_feed.latest_slice(df, OR_START, EXIT_T)
-                            slice_or  = data_feed.latest_slice(df, OR_START, OR_END)
-                            slice_win.index = pd.to_datetime(slice_win["time_ny"])
-                            slice_or.index  = pd.to_datetime(slice_or["time_ny"])
+                            win_mod = minute_of_day(slice_win.index)
+                            slice_or  = or_window(slice_win, win_mod)
 
-                        if len(slice_or) == or_expected_rows:
+                        if len(slice_or) == OR_EXPECTED_ROWS and or_closed(slice_or):
                             or_slice_is_complete = True
                             if i > 0: # Log only if it wasn't complete on the first try
                                 logger.info(f"OR data is complete on attempt {i+1}.")
@@ -378,53 +640,36 @@ def main_loop():
                             if i < 2: # Don't log retry message on the last attempt
                                 logger.warning(
                                     f"OR data incomplete on attempt {i+1} "
-                                    f"({len(slice_or)}/{or_expected_rows} rows). Retrying in 15s."
+                                    f"({len(slice_or)}/{OR_EXPECTED_ROWS} rows). Retrying in 15s."
                                 )
-                                time.sleep(15)
+                                await asyncio.sleep(15)
+
+                    if not or_closed(slice_or):
+                        logger.info(f"OR bar {OR_END} present but not complete; waiting...")
+                        await asyncio.sleep(10)
+                        continue
 
                     log_msg, tweet_msg, should_skip = check_or_completeness(
-                        slice_or, or_expected_rows, trade_date, OR_START, OR_END, 
+                        slice_or, OR_EXPECTED_ROWS, trade_date, OR_START, OR_END, 
                         OR_INCOMPLETE_TOLERANCE, NY
                     )
                     
                     if should_skip:
-                        skipped_days[trade_date] = "or_incomplete"
-                        summary["skipped"] += 1
-                        logger.warning(log_msg)
-                        try:
-                            if tweet_msg:
-                                notifier.notify_trade(tweet_msg)
-                        except Exception:
-                            logger.exception("Notifier error while posting skip day alert")
-                        
-                        handled_days.add(trade_date)
-                        last_trade_date = trade_date
-                        time.sleep(60)
+                        skip_day(trade_date, "or_incomplete", log_msg, tweet_msg)
+                        await asyncio.sleep(60)
                         continue
                     elif log_msg:
                         # Log if it was incomplete but within tolerance
                         logger.warning(log_msg)
                 
-                or_high, or_low = slice_or["high"].max(), slice_or["low"].min()
+                or_high, or_low, or_rng, t_cut, b_cut = or_levels(slice_or)
                 if or_high == or_low:
-                    if trade_date not in skipped_days:
-                        skipped_days[trade_date] = "or_zero_range"
-                        summary["skipped"] += 1
-                        msg = "Skipping day (OR range zero)"
-                        logger.warning(msg)
-                        try:
-                            notifier.notify_trade(f"WARNING: {msg}")
-                        except Exception:
-                            logger.exception("Notifier error while posting skip day alert")
-                        handled_days.add(trade_date)
-                        last_trade_date = trade_date
-                    time.sleep(60); continue
+                    msg = "Skipping day (OR range zero)"
+                    skip_day(trade_date, "or_zero_range", msg, f"WARNING: {msg}")
+                    await asyncio.sleep(60); continue
                 
                 # OR is valid; announce levels if not yet done
-                if trade_date not in skipped_days and or_announced_for != trade_date:
-                    or_rng = or_high - or_low
-                    t_cut = or_high - TOP_PCT * or_rng
-                    b_cut = or_low + BOT_PCT * or_rng
+                if trade_ord not in skipped_days and or_announced_for != trade_date:
                     msg = (f"OR Levels {OR_START}-{OR_END}: {or_low:.2f}-{or_high:.2f} | "
                            f"Long > {t_cut:.2f} | Short < {b_cut:.2f}")
                     
@@ -441,7 +686,7 @@ def main_loop():
                             "tp_points": TP_PTS
                         },
                         "or_high": or_high, "or_low": or_low, "or_range": or_rng,
-                        "or_completeness": f"{len(slice_or)}/{or_expected_rows}",
+                        "or_completeness": f"{len(slice_or)}/{OR_EXPECTED_ROWS}",
                         "or_candles": slice_or.to_dict(orient="records")
                     }
                     logger.info(msg)
@@ -456,19 +701,24 @@ def main_loop():
                         logger.exception("Failed to generate OR chart")
 
                     try:
-                        notifier.notify_trade(msg, image_buffer=img_buf)
+                        notify(msg, image_buffer=img_buf)
                     except Exception:
                         logger.exception("Notifier error OR levels")
                     or_announced_for = trade_date
+                levels = _or_cache[trade_date] = (or_high, or_low, or_rng, t_cut, b_cut)
+
+            if levels is not None:
+                or_high, or_low = levels[0], levels[1]
 
             if ny_now < entry_wait_dt:
-                time.sleep(10); continue
+                # Nothing actionable until the next OR/entry boundary or heartbeat
+                await sleep_until(next_session_event(ny_now, trade_date, last_heartbeat_at + hb_interval)); continue
 
             # PRE-TRADE CHECKS: Log Volatility & Spread before decision
             if "pre_trade_checks" not in daily_details:
                 current_spread = 0.0
                 if PLACE_ORDERS: # Only fetch live spread if we are actually trading/connected
-                    current_spread = broker_oanda.get_current_spread()
+                    current_spread = await broker_oanda.get_current_spread_async()
                 
                 current_atr = calculate_atr(df, period=14)
                 daily_details["pre_trade_checks"] = {
@@ -478,22 +728,22 @@ def main_loop():
                 }
 
             # compute signal
-            sig, reason = compute_signal(slice_win, slice_or)
+            sig, reason = compute_signal(slice_win, slice_or, levels, mod=win_mod)
             if sig is None:
                 if reason == "entry_incomplete":
                     logger.info(f"Entry candle {ENTRY_T} present but not complete; waiting...")
-                    time.sleep(10)
+                    await asyncio.sleep(10)
                     continue
                 logger.info(f"No trade ({reason})")
                 # Optional: Tweet that no trade was taken
                 try:
-                    notifier.notify_trade(f"No trade taken ({reason})")
+                    notify(f"No trade taken ({reason})")
                 except Exception:
                     logger.exception("Notifier error no trade")
                 last_trade_date = trade_date
                 summary["skipped"] += 1
-                handled_days.add(trade_date)
-                time.sleep(60)
+                handled_days.add(trade_ord)
+                await asyncio.sleep(60)
                 continue
 
             side, entry, sl, tp = sig
@@ -518,7 +768,7 @@ def main_loop():
                 units = qty if side == "long" else -qty
                 
                 # Use DISTANCE to ensure fixed risk ($2000) regardless of slippage
-                resp = broker_oanda.submit_market_with_sl_tp(
+                resp = await broker_oanda.submit_market_with_sl_tp_async(
                     units=units, sl_distance=SL_PTS, tp_distance=TP_PTS
                 )
                 
@@ -526,7 +776,7 @@ def main_loop():
                 if "orderCancelTransaction" in resp:
                     cancel_reason = resp["orderCancelTransaction"].get("reason", "UNKNOWN")
                     if cancel_reason == "INSUFFICIENT_MARGIN":
-                        acct = broker_oanda.get_account_summary()
+                        acct = await broker_oanda.get_account_summary_async()
                         margin_avail = acct.get("margin_available", 0)
                         ccy = acct.get("currency", "")
                         err_msg = (f"TRADE REJECTED: Insufficient Margin. "
@@ -534,7 +784,7 @@ def main_loop():
                                    f"Margin Avail: {margin_avail:,.2f} {ccy}. "
                                    "Strategy requires more capital for this size.")
                         logger.error(err_msg)
-                        notifier.notify_trade(f"CRITICAL: {err_msg}")
+                        notify(f"CRITICAL: {err_msg}")
                     else:
                         logger.error(f"Order rejected: {cancel_reason}")
                 else:
@@ -564,23 +814,28 @@ def main_loop():
                         logger.warning("Could not parse fill details; stats may use signal price.")
 
                     summary["orders"] += 1
-                    try:
-                        notifier.notify_trade(f"Paper trade {side.upper()} @ {entry:.2f} SL {sl:.2f} TP {tp:.2f} ({trade_date})")
-                    except Exception:
-                        logger.exception("Notifier error while posting trade")
+                    await after_fill(
+                        f"Paper trade {side.upper()} @ {entry:.2f} SL {sl:.2f} TP {tp:.2f} ({trade_date})"
+                    )
             else:
                 logger.info("PLACE_ORDERS=False -> log-only mode")
 
             last_trade_date = trade_date
+            handled_days.add(trade_ord)  # decided: later iterations sleep instead of polling candles
 
             # Monitor the trade until it's closed by SL/TP or until the hard exit time.
             if PLACE_ORDERS and order_active:
                 logger.info("Monitoring open trade for SL/TP or 12:00 hard exit.")
                 trade_closed_by_broker = False
-                while now_ny().time() < EXIT_T_T:
-                    time.sleep(30)  # Check every 30 seconds
+                exit_dt = session_dt(trade_date, EXIT_T_T)
+                remaining = (exit_dt - now_ny()).total_seconds()
+                while remaining > 0:
+                    await asyncio.sleep(min(30.0, remaining))  # check every 30s, never past the hard exit
+                    remaining = (exit_dt - now_ny()).total_seconds()  # one clock read per check
+                    if remaining <= 0:
+                        break  # the hard-exit close below re-reads the trades anyway
                     try:
-                        open_trades = broker_oanda.get_open_trades()
+                        open_trades = await broker_oanda.get_open_trades_async(fresh=True)
                         if not open_trades:
                             logger.info("Trade closed by broker (SL/TP hit).")
                             trade_closed_by_broker = True
@@ -592,12 +847,12 @@ def main_loop():
                 exit_px = None
                 exit_ts = None
                 exit_details = ""
+                df_post = None
                 if not trade_closed_by_broker:
                     logger.info(f"Hard exit time {EXIT_T} reached. Closing any open trades.")
-                    closed = broker_oanda.close_all_trades()
-                    logger.info(f"Hard exit close_all: {closed}")
-                    count = len(closed)
-                    exit_details = f"Hard Exit @ {EXIT_T} NY. Closed {count} positions.\n"
+                    (closed_count, responses), df_post = await close_and_fetch(count=400)
+                    logger.info(f"Hard exit close_all: {responses}")
+                    exit_details = f"Hard Exit @ {EXIT_T} NY. Closed {closed_count} trades.\n"
                     exit_reason = "time"
                 else:
                     logger.info("Trade closed by broker; classifying exit using price path.")
@@ -610,24 +865,25 @@ def main_loop():
                 try:
                     # Fetch data covering the trade duration (Entry -> Now)
                     # Use a buffer (400 candles) to ensure we cover the start
-                    df_post = data_feed.fetch_m1(count=400)
-                    dt_entry = pd.Timestamp.combine(trade_date, ENTRY_T_T).tz_localize(NY)
+                    if isinstance(df_post, Exception):
+                        raise df_post
+                    if df_post is None:
+                        df_post = await data_feed.fetch_m1_async(count=400)
+                    dt_entry = session_dt(trade_date, ENTRY_T_T)
                     dt_exit_actual = now_ny()
                     
-                    # Filter for trade window (excluding entry bar itself to see subsequent price action)
-                    mask = (df_post["time_ny"] > dt_entry) & (df_post["time_ny"] <= dt_exit_actual)
-                    df_trade = df_post.loc[mask]
+                    # Filter for trade window (excluding entry bar itself to see subsequent price action).
+                    # fetch_m1 already indexes by sorted time_ny, so bisect instead of masking/re-indexing.
+                    lo = df_post.index.searchsorted(dt_entry, side="right")
+                    hi = df_post.index.searchsorted(dt_exit_actual, side="right")
+                    df_trade = df_post.iloc[lo:hi]
                     
                     if not df_trade.empty:
-                        df_plot = df_trade.copy()
-                        df_plot.index = pd.to_datetime(df_plot["time_ny"])
+                        df_plot = df_trade
 
                         sim_res = simulate_exit(df_plot, side, entry, sl, tp)
-                        exit_reason = exit_reason or sim_res.get("exit_reason")
-                        exit_px = sim_res.get("exit_px")
-                        exit_ts = sim_res.get("exit_ts")
-                        mfe = sim_res.get("mfe", 0.0)
-                        mae = sim_res.get("mae", 0.0)
+                        exit_reason = exit_reason or sim_res.exit_reason
+                        exit_px, exit_ts, mfe, mae = sim_res.exit_px, sim_res.exit_ts, sim_res.mfe, sim_res.mae
 
                         if exit_px is None:
                             exit_px = float(df_plot.iloc[-1]["close"])
@@ -681,42 +937,36 @@ def main_loop():
 
                     full_msg = f"{exit_details}{stats_msg}"
                     if full_msg.strip():
-                        notifier.notify_trade(full_msg, image_buffer=img_buf)
+                        notify(full_msg, image_buffer=img_buf)
                 except Exception:
                     logger.exception("Notifier error while posting exit/stats")
             else: # If not placing orders, just wait until exit time as before
-                while now_ny().time() < EXIT_T_T:
-                    time.sleep(30)
+                exit_dt = session_dt(trade_date, EXIT_T_T)
+                await asyncio.sleep(max(0.0, (exit_dt - now_ny()).total_seconds()))
 
         except Exception as e:
             logger.exception(f"Error: {e} (last fetch latency_ms={fetch_latency_ms})")
             summary["errors"] += 1
-            time.sleep(60)
+            await asyncio.sleep(60)
         finally:
-            # Flush summary after exit window (post 12:05 NY) once per trade_date
-            ny_now = now_ny()
-            after_exit = ny_now.time() >= EXIT_T_T
-            if after_exit and last_trade_date and summary_flushed_for != last_trade_date and session_started_for == last_trade_date:
-                fname = summary_path / f"{last_trade_date}_summary.log"
+            # Flush summary after exit window once per trade_date; most iterations stop at the cheap checks
+            flush_pending = last_trade_date and summary_flushed_for != last_trade_date and session_started_for == last_trade_date
+            if flush_pending and minute_now(now_ny()) >= EXIT_MOD:
                 end_snapshot = None
                 try:
-                    end_snapshot = broker_oanda.get_account_summary()
+                    end_snapshot = await broker_oanda.get_account_summary_async()
                     pnl_nav = None
                     pnl_bal = None
                     if start_account_snapshot:
                         pnl_nav = end_snapshot["nav"] - start_account_snapshot.get("nav", 0.0)
                         pnl_bal = end_snapshot["balance"] - start_account_snapshot.get("balance", 0.0)
-                    pnl_nav_disp = f"{pnl_nav:+.2f}" if pnl_nav is not None else "n/a"
-                    pnl_bal_disp = f"{pnl_bal:+.2f}" if pnl_bal is not None else "n/a"
                     logger.info(
-                        "SESSION_ACCOUNT_END "
-                        f"balance={end_snapshot['balance']:.2f} "
-                        f"nav={end_snapshot['nav']:.2f} "
-                        f"utpl={end_snapshot['unrealized_pl']:.2f} "
-                        f"open_trades={end_snapshot['open_trade_count']} "
-                        f"ccy={end_snapshot['currency']} "
-                        f"pnl_nav={pnl_nav_disp} "
-                        f"pnl_bal={pnl_bal_disp}"
+                        "SESSION_ACCOUNT_END balance=%.2f nav=%.2f utpl=%.2f open_trades=%s ccy=%s "
+                        "pnl_nav=%s pnl_bal=%s",
+                        end_snapshot["balance"], end_snapshot["nav"], end_snapshot["unrealized_pl"],
+                        end_snapshot["open_trade_count"], end_snapshot["currency"],
+                        "n/a" if pnl_nav is None else f"{pnl_nav:+.2f}",
+                        "n/a" if pnl_bal is None else f"{pnl_bal:+.2f}",
                     )
                 except Exception:
                     logger.exception("Could not fetch account summary at session end")
@@ -730,38 +980,29 @@ def main_loop():
                        f"skipped={summary['skipped']} errors={summary['errors']} last={summary['last_signal']}{pnl_nav_str}")
                 logger.info(f"SESSION_END {msg}")
                 # Persist daily summary CSV for quick review
-                headers = [
-                    "date", "signals", "orders", "skipped", "errors", "last_signal",
-                    "balance_start", "nav_start", "balance_end", "nav_end",
-                    "pnl_balance", "pnl_nav", "open_trades_end", "currency",
-                ]
-                row = {
-                    "date": last_trade_date,
-                    "signals": summary["signals"],
-                    "orders": summary["orders"],
-                    "skipped": summary["skipped"],
-                    "errors": summary["errors"],
-                    "last_signal": summary["last_signal"],
-                    "balance_start": start_account_snapshot.get("balance") if start_account_snapshot else None,
-                    "nav_start": start_account_snapshot.get("nav") if start_account_snapshot else None,
-                    "balance_end": end_snapshot.get("balance") if end_snapshot else None,
-                    "nav_end": end_snapshot.get("nav") if end_snapshot else None,
-                    "pnl_balance": pnl_bal if start_account_snapshot and end_snapshot else None,
-                    "pnl_nav": pnl_nav if start_account_snapshot and end_snapshot else None,
-                    "open_trades_end": end_snapshot.get("open_trade_count") if end_snapshot else None,
-                    "currency": end_snapshot.get("currency") if end_snapshot else None,
-                }
-                write_header = not trade_log_path.exists()
-                with open(trade_log_path, "a", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    if write_header:
-                        writer.writeheader()
-                    writer.writerow(row)
+                have_both = bool(start_account_snapshot and end_snapshot)
+                row = (
+                    last_trade_date,
+                    summary["signals"],
+                    summary["orders"],
+                    summary["skipped"],
+                    summary["errors"],
+                    summary["last_signal"],
+                    start_account_snapshot.get("balance") if start_account_snapshot else None,
+                    start_account_snapshot.get("nav") if start_account_snapshot else None,
+                    end_snapshot.get("balance") if end_snapshot else None,
+                    end_snapshot.get("nav") if end_snapshot else None,
+                    pnl_bal if have_both else None,
+                    pnl_nav if have_both else None,
+                    end_snapshot.get("open_trade_count") if end_snapshot else None,
+                    end_snapshot.get("currency") if end_snapshot else None,
+                )
+                # Fields never contain commas/quotes, so a plain join matches csv.writer output
+                trade_log.write(",".join("" if v is None else str(v) for v in row) + "\r\n")
+                trade_log.flush()
                 
                 # Save Rich JSON Log
                 if daily_details:
-                    json_dir = summary_path / "daily_json"
-                    json_dir.mkdir(parents=True, exist_ok=True)
                     json_path = json_dir / f"{last_trade_date}.json"
                     
                     # Update PnL in trade_result if available from session summary
@@ -774,11 +1015,10 @@ def main_loop():
                     with open(json_path, "w") as f:
                         json.dump(daily_details, f, cls=DateTimeEncoder, indent=2)
 
-                with open(fname, "a", encoding="utf-8") as f:
-                    f.write(msg + "\n")
+                summary_logger.info(msg)
                 logger.info(f"Wrote daily summary: {msg}")
                 try:
-                    notifier.notify_trade(
+                    notify(
                         f"Recap {last_trade_date}: "
                         f"signals {summary['signals']}, orders {summary['orders']}, skipped {summary['skipped']}, errors {summary['errors']} |"
                         f"{pnl_nav_str}"
@@ -791,52 +1031,107 @@ def main_loop():
                 start_account_snapshot = None
                 session_started_for = None
 
-
-if __name__ == "__main__":
-    if REPLAY_FILE:
-        logger.info(f"Replay mode from {REPLAY_FILE}")
-        df = pd.read_csv(REPLAY_FILE)
-        # Ensure time_ny is parsed and tz-aware
-        if "time_ny" in df.columns:
-            df["time_ny"] = pd.to_datetime(df["time_ny"]).dt.tz_convert(NY)
-        elif "time" in df.columns:
-            df["time_ny"] = pd.to_datetime(df["time"]).dt.tz_localize("UTC").dt.tz_convert(NY)
+            # Persist the current day's decision/summary whenever it changes (restart safety)
+            state_sig = (last_trade_date, len(handled_days), summary_flushed_for, tuple(summary.values()))
+            if last_trade_date and state_sig != saved_state_sig:
+                state_ord = last_trade_date.toordinal()
+                try:
+                    save_day_state(state_path, {
+                        "date": str(last_trade_date),
+                        "skip_reason": skipped_days.get(state_ord),
+                        "summary": summary,
+                        "flushed": summary_flushed_for == last_trade_date,
+                    })
+                    saved_state_sig = state_sig
+                except Exception:
+                    logger.exception("Could not persist trade-day state")
+
+
+def load_replay_csv(path, day=None, chunksize: int = 100_000) -> pd.DataFrame:
+    """Read a replay CSV in chunks, keeping only one NY trading day (`day`, or the
+    latest day in the file) so multi-day files never sit fully in memory."""
+    header = pd.read_csv(path, nrows=0).columns
+    time_col = "time_ny" if "time_ny" in header else "time"
+    usecols = [time_col] + [c for c in ("open", "high", "low", "close", "complete") if c in header]
+    # Explicit dtypes let the C parser skip per-column type inference
+    dtypes = {c: "float64" for c in usecols if c in ("open", "high", "low", "close")}
+    # Compare NY midnights (datetime64) rather than building Python date objects per row
+    kept, kept_day = [], pd.Timestamp(day).tz_localize(NY) if day is not None else None
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize, engine="c"):
+        # Ensure time_ny is parsed and tz-aware (a bare "time" column is UTC)
+        t = pd.to_datetime(chunk.pop(time_col), utc=True, format="ISO8601").dt.tz_convert(NY)
+        chunk.insert(0, "time_ny", t)
+        dates = t.dt.normalize()
+        if day is None:
+            last = dates.max()
+            if kept_day is None or last > kept_day:
+                kept, kept_day = [], last
+        chunk = chunk[dates == kept_day]
+        if not chunk.empty:
+            kept.append(chunk)
+    if not kept:
+        # Same shape as a loaded day (tz-aware index), so callers see an empty session, not a crash
+        empty = pd.DatetimeIndex([], tz=NY, name="time_ny")
+        cols = {c: np.array([], dtype=bool if c == "complete" else "float64") for c in usecols[1:]}
+        return pd.DataFrame({"time_ny": empty, **cols}, index=empty)
+    df = pd.concat(kept, ignore_index=True)
+    if not df["time_ny"].is_monotonic_increasing:  # fetch_session writes bars in order
         df = df.sort_values("time_ny")
-        df.index = pd.to_datetime(df["time_ny"])
-        slice_win = data_feed.latest_slice(df, OR_START, EXIT_T)
-        slice_or  = data_feed.latest_slice(df, OR_START, OR_END)
-        
-        # Consolidated Report Builder
-        report_lines = []
-        img_buf = None
-        or_chart_buf = None
-        
-        # Extract date for report/chart
-        r_date = datetime.now().date()
-        try:
-             r_date = pd.to_datetime(Path(REPLAY_FILE).stem.replace("replay_", "")).date()
-        except Exception:
-             pass
-
-        # 1. Session Info
-        overview = format_session_overview()
-        report_lines.append("--- SESSION LIVE ---")
-        report_lines.append(f"{overview}")
-        report_lines.append("Account: [BALANCE_START] [NAV_START] (Simulated)")
-
-        # Parity check: Ensure OR has full data, just like main_loop
-        or_expected_rows = len(pd.date_range(pd.Timestamp(OR_START), pd.Timestamp(OR_END), freq="min"))
-        if len(slice_or) != or_expected_rows:
-            logger.warning(f"Replay: OR incomplete (rows={len(slice_or)} expected={or_expected_rows}); skipping to match live logic")
-            report_lines.append(f"\n[SKIPPED] OR incomplete ({len(slice_or)}/{or_expected_rows} rows)")
-        else:
-            # 2. OR Levels
-            or_high, or_low = slice_or["high"].max(), slice_or["low"].min()
-            or_rng = or_high - or_low
-            t_cut = or_high - TOP_PCT * or_rng
-            b_cut = or_low + BOT_PCT * or_rng
-            
-            # Generate OR Chart
+    return df.set_index("time_ny", drop=False)
+
+
+def replay_file_date(path):
+    """Trade date from a `replay_YYYY-MM-DD.csv` name, or None if the name has no date."""
+    try:
+        return pd.to_datetime(Path(path).stem.replace("replay_", "")).date()
+    except Exception:
+        return None
+
+
+def run_replay(path, tweet: bool = False) -> dict:
+    """Replay one CSV through the live decision logic and return the day's outcome.
+    The consolidated report is logged; charts are only rendered when tweeting."""
+    logger.info(f"Replay mode from {path}")
+    # Extract date for report/chart
+    file_date = replay_file_date(path)
+    r_date = file_date or datetime.now().date()
+
+    df = load_replay_csv(path, day=file_date)
+    slice_win = data_feed.latest_slice(df, OR_START, EXIT_T)
+    win_mod = minute_of_day(slice_win.index)
+    slice_or  = or_window(slice_win, win_mod)
+
+    # Consolidated Report Builder
+    report_lines = []
+    img_buf = None
+    or_chart_buf = None
+    sig, res = None, None
+    outcome = {"date": str(r_date), "file": str(path), "decision": None}
+
+    # 1. Session Info
+    report_lines.append(f"--- SESSION LIVE ---\n{SESSION_OVERVIEW}\nAccount: [BALANCE_START] [NAV_START] (Simulated)")
+
+    # Parity check: Ensure OR has full data, just like main_loop
+    day = replay_day(
+        win_mod,
+        slice_win["high"].to_numpy(dtype="float64"),
+        slice_win["low"].to_numpy(dtype="float64"),
+        slice_win["close"].to_numpy(dtype="float64"),
+        slice_win["complete"].to_numpy() if "complete" in slice_win.columns else None,
+    )
+    outcome["decision"] = day["decision"]
+    if day["decision"] == "no_data":
+        logger.warning(f"Replay: no bars for {r_date} in {path}; nothing to replay")
+        return outcome
+    if day["decision"] == "or_incomplete":
+        logger.warning(f"Replay: OR incomplete (rows={len(slice_or)} expected={OR_EXPECTED_ROWS}); skipping to match live logic")
+        report_lines.append(f"\n[SKIPPED] OR incomplete ({len(slice_or)}/{OR_EXPECTED_ROWS} rows)")
+    else:
+        # 2. OR Levels
+        or_high, or_low, t_cut, b_cut = day["or_high"], day["or_low"], day["top_cut"], day["bottom_cut"]
+
+        # Generate OR Chart
+        if tweet:
             try:
                 or_chart_buf = plotting.create_or_chart(
                     slice_or, r_date, or_high, or_low, t_cut, b_cut
@@ -844,92 +1139,135 @@ if __name__ == "__main__":
             except Exception:
                 logger.exception("Failed to generate OR chart in replay")
 
-            report_lines.append("\n--- OR LEVELS ---")
-            report_lines.append(f"Range: {or_low:.2f}-{or_high:.2f}")
-            report_lines.append(f"Long > {t_cut:.2f} | Short < {b_cut:.2f}")
+        report_lines.append(f"\n--- OR LEVELS ---\nRange: {or_low:.2f}-{or_high:.2f}\n"
+                            f"Long > {t_cut:.2f} | Short < {b_cut:.2f}")
 
-            has_entry = any(slice_win.index.time == ENTRY_T_T)
-            if not has_entry:
-                logger.warning("Replay: missing entry bar; skipping")
-                report_lines.append("\n[SKIPPED] Missing entry bar")
-            else:
-                sig, reason = compute_signal(slice_win, slice_or)
-                if sig is None:
-                    logger.info(f"Replay: no trade ({reason})")
-                    report_lines.append(f"\n[NO TRADE] {reason}")
-                else:
-                    side, entry, sl, tp = sig
-                    logger.info(f"Replay: Signal {side} @ {entry:.2f} | SL {sl:.2f} | TP {tp:.2f}")
-                    report_lines.append(f"\n[SIGNAL] {side.upper()} @ {entry:.2f}")
-                    report_lines.append(f"SL {sl:.2f} | TP {tp:.2f}")
-
-                    # Simulate exit/PnL on the replay window
-                    res = simulate_exit(slice_win, side, entry, sl, tp)
-                    logger.info(f"Replay: Exit {res['exit_reason']} @ {res['exit_px']} | pnl_pts={res['pnl_pts']} pnl_usd={res['pnl_usd']} MFE={res['mfe']:.2f} MAE={res['mae']:.2f}")
-                    
-                    report_lines.append(f"\n[EXIT] {res['exit_reason']} @ {res['exit_px']:.2f}")
-                    report_lines.append(f"PnL: ${res['pnl_usd']:.2f} ({res['pnl_pts']:.2f} pts)")
-                    report_lines.append(f"Stats: MFE +{res['mfe']:.2f} | MAE -{res['mae']:.2f}")
+        reason = day["decision"]
+        if reason == "missing_entry":
+            logger.warning("Replay: missing entry bar; skipping")
+            report_lines.append("\n[SKIPPED] Missing entry bar")
+        elif "side" not in day:
+            logger.info(f"Replay: no trade ({reason})")
+            report_lines.append(f"\n[NO TRADE] {reason}")
+        else:
+            side, entry, sl, tp = sig = (day["side"], day["entry"], day["sl"], day["tp"])
+            logger.info(f"Replay: Signal {side} @ {entry:.2f} | SL {sl:.2f} | TP {tp:.2f}")
+            report_lines.append(f"\n[SIGNAL] {side.upper()} @ {entry:.2f}\nSL {sl:.2f} | TP {tp:.2f}")
+
+            # Exit/PnL on the replay window (already simulated by replay_day)
+            res = ExitResult(
+                exit_ts=slice_win.index[day["exit_i"]] if day["exit_i"] is not None else None,
+                **{k: day[k] for k in ExitResult._fields[1:]},
+            )
+            logger.info(f"Replay: Exit {res.exit_reason} @ {res.exit_px} | pnl_pts={res.pnl_pts} pnl_usd={res.pnl_usd} MFE={res.mfe:.2f} MAE={res.mae:.2f}")
+
+            report_lines.append(f"\n[EXIT] {res.exit_reason} @ {res.exit_px:.2f}\n"
+                                f"PnL: ${res.pnl_usd:.2f} ({res.pnl_pts:.2f} pts)\n"
+                                f"Stats: MFE +{res.mfe:.2f} | MAE -{res.mae:.2f}")
+            outcome.update(side=side, entry=entry, sl=sl, tp=tp,
+                           **{k: day[k] for k in ExitResult._fields[1:]})
+
+            # Generate Replay Chart
+            if tweet:
+                try:
+                    img_buf = plotting.create_trade_chart(
+                        slice_win, r_date,
+                        ENTRY_T_T, res.exit_ts,
+                        entry, res.exit_px, side,
+                        or_high, or_low, sl, tp, res.mfe, res.mae, exit_reason=res.exit_reason
+                    )
+                except Exception:
+                    logger.exception("Notifier error while generating replay chart")
+
+    # 4. Recap
+    # Determine if we had a trade for stats
+    had_trade = res is not None
+    pnl_val = res.pnl_usd if had_trade else 0.0
+    n_trades = 1 if had_trade else 0
+    report_lines.append(f"\n--- RECAP ---\nSignals: {n_trades} | Orders: {n_trades}\n"
+                        f"PnL: ${pnl_val:.2f} (Simulated)\nAccount: [BALANCE_END] [NAV_END] (Simulated)")
+
+    full_report = "\n".join(report_lines)
+
+    try:
+        logger.info("--- CONSOLIDATED REPLAY REPORT ---\n" + full_report)
+    except UnicodeEncodeError:
+        # Fallback for Windows consoles that cannot print emojis
+        logger.info("--- CONSOLIDATED REPLAY REPORT ---\n" + full_report.encode("ascii", "replace").decode("ascii"))
+
+    if tweet:
+        # Construct Tweet (Shortened to <280 chars to avoid 403 errors)
+        tweet_lines = [f"REPLAY {r_date}\nOR: {slice_or['low'].min():.2f}-{slice_or['high'].max():.2f}"]
+
+        if sig:
+            side, entry, sl, tp = sig
+            tweet_lines.append(f"Sig: {side.upper()} @ {entry:.2f}")
+            if res is not None:
+                tweet_lines.append(f"Exit: {res.exit_reason} @ {res.exit_px:.2f}\n"
+                                   f"PnL: ${res.pnl_usd:.0f} (MFE {res.mfe:.1f}/MAE {res.mae:.1f})")
+        else:
+            tweet_lines.append("No Trade")
+
+        tweet_lines.append(f"Simulated at {now_ny().strftime('%H:%M:%S')} NY")
+        tweet_msg = "\n".join(tweet_lines)
 
-                    # Generate Replay Chart
-                    try:
-                        img_buf = plotting.create_trade_chart(
-                            slice_win, r_date, 
-                            ENTRY_T_T, res['exit_ts'], 
-                            entry, res['exit_px'], side, 
-                            slice_or["high"].max(), slice_or["low"].min(), sl, tp, res['mfe'], res['mae'], exit_reason=res['exit_reason']
-                        )
-                    except Exception:
-                        logger.exception("Notifier error while generating replay chart")
-
-        # 4. Recap
-        report_lines.append("\n--- RECAP ---")
-        # Determine if we had a trade for stats
-        had_trade = 'res' in locals() and res is not None
-        pnl_val = res['pnl_usd'] if had_trade else 0.0
-        report_lines.append(f"Signals: {1 if had_trade else 0} | Orders: {1 if had_trade else 0}")
-        report_lines.append(f"PnL: ${pnl_val:.2f} (Simulated)")
-        report_lines.append("Account: [BALANCE_END] [NAV_END] (Simulated)")
-
-        full_report = "\n".join(report_lines)
-        
         try:
-            logger.info("--- CONSOLIDATED REPLAY REPORT ---\n" + full_report)
-        except UnicodeEncodeError:
-            # Fallback for Windows consoles that cannot print emojis
-            logger.info("--- CONSOLIDATED REPLAY REPORT ---\n" + full_report.encode("ascii", "replace").decode("ascii"))
-
-        if REPLAY_TWEETS:
-            # Construct Tweet (Shortened to <280 chars to avoid 403 errors)
-            tweet_lines = []
-            tweet_lines.append(f"REPLAY {r_date}")
-            tweet_lines.append(f"OR: {slice_or['low'].min():.2f}-{slice_or['high'].max():.2f}")
-            
-            if 'sig' in locals() and sig:
-                side, entry, sl, tp = sig
-                tweet_lines.append(f"Sig: {side.upper()} @ {entry:.2f}")
-                if 'res' in locals():
-                    tweet_lines.append(f"Exit: {res['exit_reason']} @ {res['exit_px']:.2f}")
-                    tweet_lines.append(f"PnL: ${res['pnl_usd']:.0f} (MFE {res['mfe']:.1f}/MAE {res['mae']:.1f})")
+            charts = []
+            if or_chart_buf: charts.append(or_chart_buf)
+            if img_buf: charts.append(img_buf)
+
+            posted = notifier.notify_trade(tweet_msg, images=charts)
+            if posted and posted.get("status") == "posted":
+                logger.info("Replay tweet sent.")
             else:
-                tweet_lines.append("No Trade")
-            
-            tweet_lines.append(f"Simulated at {now_ny().strftime('%H:%M:%S')} NY")
-            tweet_msg = "\n".join(tweet_lines)
+                logger.warning(f"Replay tweet failed: {posted.get('reason') if posted else 'unknown'}")
+        except Exception:
+            logger.exception("Notifier error while posting replay report")
 
-            try:
-                charts = []
-                if or_chart_buf: charts.append(or_chart_buf)
-                if img_buf: charts.append(img_buf)
+    logger.info("Replay complete.")
+    return outcome
 
-                res = notifier.notify_trade(tweet_msg, images=charts)
-                if res and res.get("status") == "posted":
-                    logger.info("Replay tweet sent.")
-                else:
-                    logger.warning(f"Replay tweet failed: {res.get('reason') if res else 'unknown'}")
-            except Exception:
-                logger.exception("Notifier error while posting replay report")
 
-        logger.info("Replay complete.")
+def sweep_day(path) -> dict:
+    """Sweep worker: load one replay CSV and run replay_day on its arrays.
+    Returns the same outcome fields as run_replay, without building the report.
+    A file that cannot be read is reported as an "error" outcome instead of aborting the sweep."""
+    file_date = replay_file_date(path)
+    outcome = {"date": str(file_date or datetime.now().date()), "file": str(path)}
+    try:
+        slice_win = data_feed.latest_slice(load_replay_csv(path, day=file_date), OR_START, EXIT_T)
+    except Exception as e:
+        logger.warning(f"Sweep: could not load {path}: {e}")
+        return {**outcome, "decision": "error", "error": str(e)}
+    day = replay_day(
+        minute_of_day(slice_win.index),
+        slice_win["high"].to_numpy(dtype="float64"),
+        slice_win["low"].to_numpy(dtype="float64"),
+        slice_win["close"].to_numpy(dtype="float64"),
+        slice_win["complete"].to_numpy() if "complete" in slice_win.columns else None,
+    )
+    outcome["decision"] = day["decision"]
+    if "side" in day:
+        outcome.update({k: day[k] for k in ("side", "entry", "sl", "tp", "exit_reason", "exit_px", "pnl_pts", "pnl_usd", "mfe", "mae")})
+    return outcome
+
+
+def run_sweep(source, max_workers=None) -> list:
+    """Replay every replay_*.csv in `source` (a folder or a glob pattern) across a process pool, one day per task."""
+    paths = sorted(Path(source).glob("replay_*.csv")) if Path(source).is_dir() else sorted(map(Path, glob(str(source))))
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        outcomes = list(pool.map(sweep_day, paths, chunksize=max(1, len(paths) // (4 * (os.cpu_count() or 1)))))
+    trades = [o for o in outcomes if o.get("pnl_usd") is not None]
+    total = sum(o["pnl_usd"] for o in trades)
+    errors = sum(o["decision"] == "error" for o in outcomes)
+    logger.info(f"Sweep complete: {len(outcomes)} days, {len(trades)} trades, {errors} errors, pnl_usd={total:.2f}")
+    return outcomes
+
+
+if __name__ == "__main__":
+    if REPLAY_DIR or REPLAY_GLOB:
+        run_sweep(REPLAY_DIR or REPLAY_GLOB)
+    elif REPLAY_FILE:
+        run_replay(REPLAY_FILE, tweet=REPLAY_TWEETS)
     else:
-        main_loop()
+        asyncio.run(main_loop())
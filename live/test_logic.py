@@ -4,6 +4,8 @@ Run with: pytest tests/test_logic.py
 """
 import sys
 from pathlib import Path
+import numpy as np
+import orjson
 import pandas as pd
 import pytest
 from datetime import date
@@ -12,7 +14,10 @@ import pytz
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from live.run_bot import compute_signal, check_or_completeness
+from live import broker_oanda, data_feed, run_bot
+from live.broker_oanda import ttl_cache
+from live.run_bot import compute_signal, check_or_completeness, exit_on_path, replay_day, save_day_state, load_day_state
+from src.or_core import first_exit
 
 # Mock configuration constants for the test
 ENTRY_TIME_STR = "10:22"
@@ -90,6 +95,17 @@ def test_replay_scenario_complete_candle():
     assert reason == "short"
     print("[PASS] Replay Scenario: Complete candle correctly triggers signal.")
 
+def test_missing_entry_bar():
+    """No bar at the entry minute: the signal must report it as missing."""
+    win_df = create_mock_data(entry_price=120, complete=True)
+    win_df.index = win_df.index - pd.Timedelta(minutes=1)
+    or_df = create_mock_or(high=200, low=100)
+
+    signal, reason = compute_signal(win_df, or_df)
+
+    assert signal is None
+    assert reason == "missing_entry"
+
 
 def test_or_completeness_full(mock_or_data):
     """Test OR completeness check when data is full."""
@@ -119,4 +135,226 @@ def test_or_completeness_skipped(mock_or_data):
     )
     assert should_skip
     assert "Skipping day" in log_msg
-    assert "WARNING: Skipping day" in tweet_msg
\ No newline at end of file
+    assert "WARNING: Skipping day" in tweet_msg
+
+
+# ----------------------------- Caching -----------------------------
+
+def test_ttl_cache_hit_and_invalidate():
+    calls = []
+
+    @ttl_cache(seconds=60)
+    def fetch(x):
+        calls.append(x)
+        return x * 2
+
+    assert fetch(2) == 4 and fetch(2) == 4
+    assert calls == [2]
+    fetch.invalidate()
+    assert fetch(2) == 4 and calls == [2, 2]
+
+
+def test_ttl_cache_refresh():
+    """refresh() always calls through and re-caches the new value."""
+    values = iter([1, 2])
+    fetch = ttl_cache(seconds=60)(lambda: next(values))
+    assert fetch() == 1
+    assert fetch.refresh() == 2 and fetch() == 2
+
+
+def test_ttl_cache_prime():
+    """prime() seeds the cache so the next call does not go to the network."""
+    calls = []
+    fetch = ttl_cache(seconds=60)(lambda x: calls.append(x) or x * 2)
+    fetch.prime(99, 3)
+    assert fetch(3) == 99 and calls == []
+
+
+def test_ttl_cache_expires():
+    calls = []
+    fetch = ttl_cache(seconds=0)(lambda: calls.append(1) or len(calls))
+    assert (fetch(), fetch()) == (1, 2)
+
+
+def test_day_state_round_trip(tmp_path):
+    """Saved state is only recovered on the same trade day."""
+    path = tmp_path / "state.json"
+    assert load_day_state(path, date(2025, 12, 22)) is None
+    state = {"date": "2025-12-22", "skip_reason": None, "summary": {"signals": 1}, "flushed": False}
+    save_day_state(path, state)
+    assert load_day_state(path, date(2025, 12, 22)) == state
+    assert load_day_state(path, date(2025, 12, 23)) is None
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_close_all_trades_counts_trades(monkeypatch):
+    """One positions/close response still reports every trade it flattened."""
+    trades = [{"id": str(i), "instrument": broker_oanda.OANDA_INSTRUMENT, "currentUnits": "1"} for i in range(3)]
+    cached = lambda: trades
+    cached.refresh = cached.invalidate = lambda: trades
+    monkeypatch.setattr(broker_oanda, "get_open_trades", cached)
+    monkeypatch.setattr(broker_oanda, "close_position", lambda **kw: {"longOrderFillTransaction": {}})
+    assert broker_oanda.close_all_trades() == (3, [{"longOrderFillTransaction": {}}])
+    trades.clear()
+    assert broker_oanda.close_all_trades() == (0, [])
+
+
+# ----------------------------- Candle ring buffer -----------------------------
+
+FEED_START = pd.Timestamp("2025-12-22 14:00", tz="UTC")
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Fake OANDA candle endpoint over a synthetic minute series, with a settable clock.
+    The ring buffer is shrunk (10 bars / 20 slots) so wraps happen within a few polls."""
+    state = {"now": FEED_START + pd.Timedelta(minutes=30, seconds=5), "calls": []}
+
+    def candles(params):
+        last = int((state["now"] - FEED_START) // pd.Timedelta(minutes=1))
+        times = [FEED_START + pd.Timedelta(minutes=i) for i in range(last + 1)]
+        if "from" in params:
+            times = [t for t in times if t >= pd.Timestamp(params["from"])][:params["count"]]
+        else:
+            times = times[-params["count"]:]
+        return [{"time": t.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+                 "mid": {"o": "1", "h": str(100 + i), "l": "0.5", "c": "1.5"},
+                 "complete": t != state["now"].floor("min")}
+                for i, t in ((int((t - FEED_START) // pd.Timedelta(minutes=1)), t) for t in times)]
+
+    def get(url, params=None, timeout=None):
+        state["calls"].append("from" in params)
+        resp = type("Resp", (), {})()
+        resp.content = orjson.dumps({"candles": candles(params)})
+        resp.raise_for_status = lambda: None
+        return resp
+
+    monkeypatch.setattr(data_feed.SESSION, "get", get)
+    monkeypatch.setattr(data_feed.time, "time", lambda: state["now"].timestamp())
+    monkeypatch.setattr(data_feed, "OANDA_CANDLES_TTL", 0)
+    monkeypatch.setattr(data_feed, "BUFFER_MAX", 10)
+    monkeypatch.setattr(data_feed, "_RING_CAP", 20)
+    monkeypatch.setattr(data_feed, "_ring_t", np.empty(20, dtype="datetime64[ns]"))
+    monkeypatch.setattr(data_feed, "_ring_ohlc", np.empty((20, 4), dtype="float64"))
+    monkeypatch.setattr(data_feed, "_ring_complete", np.empty(20, dtype=bool))
+    monkeypatch.setattr(data_feed, "_head", 0)
+    monkeypatch.setattr(data_feed, "_tail", 0)
+    monkeypatch.setattr(data_feed, "_polled_at", None)
+    return state
+
+
+def assert_latest_bars(df, state, count):
+    """The frame holds exactly the feed's newest `count` bars, the last one still forming."""
+    end = state["now"].floor("min")
+    expected = pd.date_range(end=end, periods=count, freq="min")
+    assert list(df["time_utc"]) == list(expected)
+    assert list(df.index) == list(expected.tz_convert(data_feed.NY))
+    assert df["high"].tolist() == [100.0 + (t - FEED_START) // pd.Timedelta(minutes=1) for t in expected]
+    assert df["complete"].tolist() == [True] * (count - 1) + [False]
+
+
+def test_fetch_m1_incremental_poll(feed):
+    """After the first full fetch, later polls only request bars from the last buffered one."""
+    assert_latest_bars(data_feed.fetch_m1(count=5), feed, 5)
+    feed["now"] += pd.Timedelta(minutes=1)
+    df = data_feed.fetch_m1(count=5)
+    assert feed["calls"] == [False, True]
+    assert_latest_bars(df, feed, 5)
+
+
+def test_fetch_m1_growing_window_stays_incremental(feed):
+    """A window that grows by one bar per minute (session_bar_count) keeps polling incrementally."""
+    for m in range(8):
+        df = data_feed.fetch_m1(count=3 + m)
+        assert_latest_bars(df, feed, 3 + m)
+        feed["now"] += pd.Timedelta(minutes=1)
+    assert feed["calls"] == [False] + [True] * 7
+
+
+def test_fetch_m1_ring_wrap(feed):
+    """Polling past the end of the ring slides the live window back without losing bars."""
+    data_feed.fetch_m1(count=10)
+    for _ in range(25):  # well past _RING_CAP writes
+        feed["now"] += pd.Timedelta(minutes=1)
+        assert_latest_bars(data_feed.fetch_m1(count=10), feed, 10)
+        assert data_feed._tail - data_feed._head == 10
+    assert feed["calls"] == [False] + [True] * 25
+
+
+def test_fetch_m1_gap_resync(feed):
+    """An incremental reply as long as the window resyncs with a full fetch; a buffer
+    that ends before the window starts skips the incremental request entirely."""
+    data_feed.fetch_m1(count=5)
+    feed["now"] += pd.Timedelta(minutes=4)  # last buffered bar is the window's first bar
+    assert_latest_bars(data_feed.fetch_m1(count=5), feed, 5)
+    assert feed["calls"] == [False, True, False]
+    feed["now"] += pd.Timedelta(hours=2)  # long downtime
+    assert_latest_bars(data_feed.fetch_m1(count=5), feed, 5)
+    assert feed["calls"] == [False, True, False, False]
+
+
+# ----------------------------- Exit scan / day kernel -----------------------------
+
+def test_first_exit_tie_break_is_stop():
+    """A bar that touches both stop and target counts as the stop, for either side."""
+    hi = np.array([105.0, 130.0])
+    lo = np.array([95.0, 70.0])
+    assert first_exit(hi, lo, sl=75.0, tp=125.0, is_long=True) == (1, "sl")
+    assert first_exit(hi, lo, sl=125.0, tp=75.0, is_long=False) == (1, "sl")
+    assert first_exit(hi, lo, sl=90.0, tp=125.0, is_long=True) == (1, "sl")
+    assert first_exit(hi, lo, sl=75.0, tp=104.0, is_long=True) == (0, "tp")
+
+
+def test_time_exit_when_no_level_hit():
+    """Neither level touched: first_exit reports none and the trade exits on the last close."""
+    hi = np.array([105.0, 106.0, 107.0])
+    lo = np.array([95.0, 96.0, 97.0])
+    close = np.array([100.0, 101.0, 102.5])
+    assert first_exit(hi, lo, sl=75.0, tp=125.0, is_long=True) == (3, None)
+    exit_i, exit_px, exit_reason, mfe, mae = exit_on_path(hi, lo, close, "long", 100.0, 75.0, 125.0)
+    assert (exit_i, exit_px, exit_reason) == (2, 102.5, "time")
+    assert (mfe, mae) == (7.0, 5.0)
+
+
+def session_arrays(entry_close, path_high=None, path_low=None):
+    """OR 09:30-10:00 at 100-200, flat bars to the 12:00 exit, and the entry bar closing at entry_close."""
+    mod = np.arange(run_bot.OR_START_MOD, run_bot.EXIT_MOD + 1)
+    high = np.where(mod <= run_bot.OR_END_MOD, 200.0, entry_close + 1)
+    low = np.where(mod <= run_bot.OR_END_MOD, 100.0, entry_close - 1)
+    close = np.where(mod <= run_bot.OR_END_MOD, 150.0, entry_close)
+    after = mod > run_bot.ENTRY_MOD
+    if path_high is not None:
+        high[after] = path_high
+    if path_low is not None:
+        low[after] = path_low
+    return mod, high, low, close
+
+
+def test_replay_day_decisions():
+    """Each replay_day decision, with OR 100-200 (cuts at 135/165 for the default zones)."""
+    _, _, _, top_cut, bottom_cut = run_bot.cut_levels(200.0, 100.0)
+    long_px, short_px, mid_px = top_cut + 5, bottom_cut - 5, (top_cut + bottom_cut) / 2
+
+    mod, high, low, close = session_arrays(mid_px)
+    assert replay_day(mod[:0], high[:0], low[:0], close[:0])["decision"] == "no_data"
+    keep = mod != run_bot.OR_START_MOD + 3
+    assert replay_day(mod[keep], high[keep], low[keep], close[keep])["decision"] == "or_incomplete"
+    keep = mod != run_bot.ENTRY_MOD
+    assert replay_day(mod[keep], high[keep], low[keep], close[keep])["decision"] == "missing_entry"
+    complete = mod != run_bot.ENTRY_MOD
+    assert replay_day(mod, high, low, close, complete)["decision"] == "entry_incomplete"
+    day = replay_day(mod, high, low, close)
+    assert day["decision"] == "none" and "side" not in day
+    assert (day["top_cut"], day["bottom_cut"]) == (top_cut, bottom_cut)
+
+    # Long: the target is hit on the first bar after entry
+    day = replay_day(*session_arrays(long_px, path_high=long_px + run_bot.TP_PTS))
+    assert (day["decision"], day["side"], day["exit_reason"]) == ("long", "long", "tp")
+    assert day["exit_px"] == long_px + run_bot.TP_PTS and day["pnl_pts"] == run_bot.TP_PTS
+    assert day["exit_i"] == run_bot.ENTRY_MOD + 1 - run_bot.OR_START_MOD
+
+    # Short: the stop is hit on the first bar after entry
+    day = replay_day(*session_arrays(short_px, path_high=short_px + run_bot.SL_PTS))
+    assert (day["decision"], day["side"], day["exit_reason"]) == ("short", "short", "sl")
+    assert day["pnl_pts"] == -run_bot.SL_PTS
+    assert day["pnl_usd"] == -run_bot.SL_PTS * run_bot.POINT_VAL * run_bot.POSITION_SIZE
@@ -1,4 +1,4 @@
-from typing import TypedDict, List, Optional, Dict, Any
+from typing import TypedDict, NamedTuple, List, Optional, Dict, Any
 
 class Candle(TypedDict):
     time_ny: str
@@ -52,6 +52,16 @@ class TradeResult(TypedDict):
     mae_points: float
     trade_path_candles: List[Candle]
 
+class ExitResult(NamedTuple):
+    """Simulated exit of one trade (simulate_exit / replay)."""
+    exit_ts: Any  # pd.Timestamp of the exit bar, None without bars after entry
+    exit_reason: Optional[str]
+    exit_px: Optional[float]
+    pnl_pts: Optional[float]
+    pnl_usd: Optional[float]
+    mfe: float
+    mae: float
+
 class DailyLog(TypedDict):
     session_setup: SessionSetup
     pre_trade_checks: Optional[PreTradeChecks]
@@ -7,6 +7,8 @@ import json
 import io
 from pathlib import Path
 
+import numpy as np
+import orjson
 import pandas as pd
 import matplotlib
 matplotlib.use("Agg") # Non-interactive backend
@@ -22,6 +24,34 @@ from live.logging_utils import setup_logger
 
 logger = setup_logger("analyzer")
 JSON_DIR = ROOT / "live" / "logs" / "summaries" / "daily_json"
+# Rows already parsed from JSON_DIR, keyed by file name + mtime, so each run only parses new/changed logs
+ROWS_CACHE = JSON_DIR.parent / "daily_rows.pkl"
+# Bump whenever the row fields built in load_all_logs change; an older cache is rebuilt
+ROWS_CACHE_VERSION = 1
+CHART_DPI = 90  # tweet-sized PNGs; higher only adds encode time and bytes
+
+def read_json(path: Path):
+    """Parse one daily log with orjson; fall back to stdlib json, which also accepts the
+    NaN/Infinity literals json.dump writes for missing floats."""
+    raw = path.read_bytes()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
+
+def load_rows_cache() -> pd.DataFrame:
+    empty = pd.DataFrame(columns=["_src", "_mtime"])
+    if not ROWS_CACHE.exists():
+        return empty
+    try:
+        cache = pd.read_pickle(ROWS_CACHE)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable rows cache {ROWS_CACHE.name}: {e}")
+        return empty
+    if not isinstance(cache, dict) or cache.get("version") != ROWS_CACHE_VERSION:
+        logger.info(f"Rows cache {ROWS_CACHE.name} is from another version; rebuilding")
+        return empty
+    return cache["rows"]
 
 def load_all_logs():
     data = []
@@ -29,58 +59,83 @@ def load_all_logs():
         logger.warning(f"No JSON directory found at {JSON_DIR}")
         return pd.DataFrame()
 
+    cached = load_rows_cache()
+    known = dict(zip(cached["_src"], cached["_mtime"]))
+    reused = []
+
     # Iterate over all JSON files
     for f in sorted(JSON_DIR.glob("*.json")):
+        mtime = f.stat().st_mtime_ns
+        if known.get(f.name) == mtime:
+            reused.append(f.name)
+            continue
         try:
-            with open(f, "r") as jf:
-                entry = json.load(jf)
-                
-                # Basic Session Info
-                row = {
-                    "date": entry.get("session_setup", {}).get("date"),
-                    "instrument": entry.get("session_setup", {}).get("instrument"),
-                }
-                
-                # Pre-trade checks (Spread/ATR)
-                checks = entry.get("pre_trade_checks", {})
-                if checks:
-                    row["spread"] = checks.get("spread", 0.0)
-                    row["atr"] = checks.get("volatility_atr_14", 0.0)
-
-                # Signal info
-                sig = entry.get("signal_decision", {})
-                if sig:
-                    row["signal"] = sig.get("signal_type")
-                    row["entry_price"] = sig.get("entry_price")
-                else:
-                    row["signal"] = "none"
-
-                # Trade Result info
-                res = entry.get("trade_result", {})
-                if res:
-                    row["pnl_usd"] = res.get("pnl_usd", 0.0)
-                    row["pnl_pts"] = res.get("pnl_points", 0.0)
-                    row["mfe"] = res.get("mfe_points", 0.0)
-                    row["mae"] = res.get("mae_points", 0.0)
-                    row["exit_reason"] = res.get("exit_reason", "n/a")
-                else:
-                    row["pnl_usd"] = 0.0
-                    row["mfe"] = 0.0
-                    row["mae"] = 0.0
-                
-                data.append(row)
+            entry = read_json(f)
+            
+            # Basic Session Info
+            row = {
+                "date": entry.get("session_setup", {}).get("date"),
+                "instrument": entry.get("session_setup", {}).get("instrument"),
+            }
+            
+            # Pre-trade checks (Spread/ATR)
+            checks = entry.get("pre_trade_checks", {})
+            if checks:
+                row["spread"] = checks.get("spread", 0.0)
+                row["atr"] = checks.get("volatility_atr_14", 0.0)
+
+            # Signal info
+            sig = entry.get("signal_decision", {})
+            if sig:
+                row["signal"] = sig.get("signal_type")
+                row["entry_price"] = sig.get("entry_price")
+            else:
+                row["signal"] = "none"
+
+            # Trade Result info
+            res = entry.get("trade_result", {})
+            if res:
+                row["pnl_usd"] = res.get("pnl_usd", 0.0)
+                row["pnl_pts"] = res.get("pnl_points", 0.0)
+                row["mfe"] = res.get("mfe_points", 0.0)
+                row["mae"] = res.get("mae_points", 0.0)
+                row["exit_reason"] = res.get("exit_reason", "n/a")
+            else:
+                row["pnl_usd"] = 0.0
+                row["mfe"] = 0.0
+                row["mae"] = 0.0
+            
+            row["_src"], row["_mtime"] = f.name, mtime
+            data.append(row)
         except Exception as e:
             logger.error(f"Error loading {f.name}: {e}")
-            
-    df = pd.DataFrame(data)
+
+    kept = cached[cached["_src"].isin(reused)]
+    df = pd.concat([kept, pd.DataFrame(data)]) if data else kept
+    df = df.sort_values("_src", kind="stable", ignore_index=True)  # file order, as if all were parsed
+    if data or len(kept) != len(cached):
+        try:
+            pd.to_pickle({"version": ROWS_CACHE_VERSION, "rows": df}, ROWS_CACHE)
+        except Exception as e:
+            logger.warning(f"Could not update rows cache {ROWS_CACHE.name}: {e}")
+    logger.info(f"Loaded {len(df)} daily logs ({len(data)} parsed, {len(kept)} from cache)")
+
+    df = df.drop(columns=["_src", "_mtime"])
     if not df.empty and "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])
         df = df.sort_values("date")
         
     return df
 
+def png_bytes(fig) -> bytes:
+    """Encode a laid-out figure as PNG bytes (no BytesIO outlives the call)."""
+    with io.BytesIO() as buf:
+        # tight_layout() already fit the axes; bbox_inches='tight' would draw the figure twice
+        fig.savefig(buf, format='png', dpi=CHART_DPI)
+        return buf.getvalue()
+
 def create_performance_charts(df):
-    """Generates in-memory PNG buffers for PnL and MFE/MAE."""
+    """Generates in-memory PNG images (bytes) for PnL and MFE/MAE."""
     charts = []
     
     # 1. Cumulative PnL Chart
@@ -91,49 +146,46 @@ def create_performance_charts(df):
             pass # Fallback
             
         fig, ax = plt.subplots(figsize=(10, 5))
-        df["cum_pnl"] = df["pnl_usd"].cumsum()
-        
-        # Plot line
-        ax.plot(df["date"], df["cum_pnl"], marker='o', linestyle='-', color='#2980B9', linewidth=2, label="Net PnL")
-        ax.fill_between(df["date"], df["cum_pnl"], 0, alpha=0.1, color='#2980B9')
-        ax.axhline(0, color='black', linewidth=1, linestyle='--')
-        
-        ax.set_title("Cumulative PnL ($)", fontsize=12, fontweight='bold')
-        ax.tick_params(axis='x', rotation=45)
-        plt.tight_layout()
-        
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        charts.append(buf)
-        plt.close(fig)
+        try:
+            df["cum_pnl"] = df["pnl_usd"].cumsum()
+            
+            # Plot line
+            ax.plot(df["date"], df["cum_pnl"], marker='o', linestyle='-', color='#2980B9', linewidth=2, label="Net PnL")
+            ax.fill_between(df["date"], df["cum_pnl"], 0, alpha=0.1, color='#2980B9')
+            ax.axhline(0, color='black', linewidth=1, linestyle='--')
+            
+            ax.set_title("Cumulative PnL ($)", fontsize=12, fontweight='bold')
+            ax.tick_params(axis='x', rotation=45)
+            fig.tight_layout()
+            charts.append(png_bytes(fig))
+        finally:
+            plt.close(fig)  # released even if drawing fails
 
     # 2. MFE vs MAE Scatter (Trade Quality)
     trades = df[df["signal"] != "none"]
     if not trades.empty:
         fig, ax = plt.subplots(figsize=(6, 6))
-        
-        # Color points: Green for Win, Red for Loss
-        colors = ['#27AE60' if p > 0 else '#C0392B' for p in trades["pnl_usd"]]
-        
-        ax.scatter(trades["mae"], trades["mfe"], c=colors, alpha=0.7, s=100, edgecolors='white')
-        
-        # 1:1 Line (Ideal is MFE > MAE, so points should be above this line)
-        max_val = max(trades["mfe"].max(), trades["mae"].max()) if not trades.empty else 10
-        if max_val == 0: max_val = 10
-        
-        ax.plot([0, max_val], [0, max_val], linestyle='--', color='gray', alpha=0.5, label="1:1 Ratio")
-        
-        ax.set_xlabel("MAE (Adverse Excursion)", fontweight='bold')
-        ax.set_ylabel("MFE (Favorable Excursion)", fontweight='bold')
-        ax.set_title("Trade Efficiency: MFE vs MAE", fontsize=12, fontweight='bold')
-        
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        charts.append(buf)
-        plt.close(fig)
+        try:
+            # Color points: Green for Win, Red for Loss
+            colors = np.where(trades["pnl_usd"].to_numpy() > 0, '#27AE60', '#C0392B')
+            mae, mfe = trades["mae"].to_numpy(dtype=float), trades["mfe"].to_numpy(dtype=float)
+            
+            ax.scatter(mae, mfe, c=colors, alpha=0.7, s=100, edgecolors='white')
+            
+            # 1:1 Line (Ideal is MFE > MAE, so points should be above this line)
+            max_val = max(mfe.max(), mae.max()) if not trades.empty else 10
+            if max_val == 0: max_val = 10
+            
+            ax.plot([0, max_val], [0, max_val], linestyle='--', color='gray', alpha=0.5, label="1:1 Ratio")
+            
+            ax.set_xlabel("MAE (Adverse Excursion)", fontweight='bold')
+            ax.set_ylabel("MFE (Favorable Excursion)", fontweight='bold')
+            ax.set_title("Trade Efficiency: MFE vs MAE", fontsize=12, fontweight='bold')
+            
+            fig.tight_layout()
+            charts.append(png_bytes(fig))
+        finally:
+            plt.close(fig)
 
     return charts
 
@@ -154,14 +206,15 @@ def main():
         logger.info("No trades executed yet.")
         return
 
-    # Metrics Calculation
-    wins = trades[trades["pnl_usd"] > 0]
-    win_rate = len(wins) / total_trades * 100
-    total_pnl = trades["pnl_usd"].sum()
+    # Metrics Calculation (one PnL array, masks instead of re-slicing the frame)
+    pnl = trades["pnl_usd"].to_numpy(dtype=float)
+    win_mask, loss_mask = pnl > 0, pnl <= 0
+    n_wins, n_losses = int(win_mask.sum()), int(loss_mask.sum())
+    win_rate = n_wins / total_trades * 100
+    total_pnl = float(np.nansum(pnl))
     
-    avg_win = wins["pnl_usd"].mean() if not wins.empty else 0.0
-    losses = trades[trades["pnl_usd"] <= 0]
-    avg_loss = losses["pnl_usd"].mean() if not losses.empty else 0.0
+    avg_win = float(pnl[win_mask].mean()) if n_wins else 0.0
+    avg_loss = float(pnl[loss_mask].mean()) if n_losses else 0.0
     
     # Expectancy formula: (Win% * AvgWin) + (Loss% * AvgLoss)
     expectancy = (win_rate/100.0 * avg_win) + ((1.0 - win_rate/100.0) * avg_loss)
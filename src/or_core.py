@@ -29,6 +29,11 @@ import numpy as np
 import pytz
 import yaml
 
+try:  # libyaml's C parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # ----------------------------- Globals / Config -----------------------------
 
 # Toggle small previews if you want (kept for parity with your notebooks)
@@ -39,8 +44,8 @@ CONFIG_DIR = ROOT / "config"
 DATA_RAW_DIR = ROOT / "data" / "raw"
 
 def _load_yaml(p: Path) -> Dict[str, Any]:
-    with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    with open(p, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 try:
     INSTR = _load_yaml(CONFIG_DIR / "instruments.yml")
@@ -61,6 +66,12 @@ EXIT_T    = session.get("hard_exit_time", "12:00")
 OR_START  = session.get("or_window", {}).get("start", "09:30")
 OR_END    = session.get("or_window", {}).get("end_inclusive", "10:00")  # inclusive
 
+# Parsed once; the helpers below compare against these on every call
+ENTRY_T_T = pd.Timestamp(ENTRY_T).time()
+EXIT_T_T  = pd.Timestamp(EXIT_T).time()
+ENTRY_MOD = ENTRY_T_T.hour * 60 + ENTRY_T_T.minute  # minutes since midnight
+EXIT_MOD  = EXIT_T_T.hour * 60 + EXIT_T_T.minute
+
 TOP_PCT   = (STRATEGY.get("parameters", {}) or {}).get("zones", {}).get("top_pct", 0.35)
 BOT_PCT   = (STRATEGY.get("parameters", {}) or {}).get("zones", {}).get("bottom_pct", 0.35)
 SL_PTS    = (STRATEGY.get("parameters", {}) or {}).get("risk", {}).get("stop_loss_points", 25)
@@ -114,16 +125,42 @@ def _load_year_df(year: int) -> pd.DataFrame:
     df.index = idx
     return df[~df.index.isna()].sort_index()
 
+@lru_cache(maxsize=16)
+def _hhmm_time(hhmm: str):
+    return pd.Timestamp(hhmm).time()
+
 def _expected_index_local(day: pd.Timestamp, start_str: str, end_str: str) -> pd.DatetimeIndex:
-    start = NY.localize(pd.Timestamp.combine(day.date(), pd.Timestamp(start_str).time()))
-    end   = NY.localize(pd.Timestamp.combine(day.date(), pd.Timestamp(end_str).time()))
-    return pd.date_range(start=start, end=end, freq="T", tz=NY)
+    start = NY.localize(pd.Timestamp.combine(day.date(), _hhmm_time(start_str)))
+    end   = NY.localize(pd.Timestamp.combine(day.date(), _hhmm_time(end_str)))
+    return pd.date_range(start=start, end=end, freq="min", tz=NY)
+
+def _minute_of_day(idx: pd.DatetimeIndex) -> np.ndarray:
+    return np.asarray(idx.hour * 60 + idx.minute)
+
+def first_exit(hi: np.ndarray, lo: np.ndarray, sl: float, tp: float, is_long: bool):
+    """
+    Position of the first bar whose high/low touches the stop or the target.
+
+    Returns (index, "sl" | "tp"), or (len(hi), None) if neither is touched.
+    A bar touching both counts as the stop (conservative tie-break). Works on
+    plain float arrays so live, replay and backtests share one scan.
+    """
+    n = len(hi)
+    tp_mask = hi >= tp if is_long else lo <= tp
+    sl_mask = lo <= sl if is_long else hi >= sl
+    i_tp = int(tp_mask.argmax()) if tp_mask.any() else n
+    i_sl = int(sl_mask.argmax()) if sl_mask.any() else n
+    if i_sl < n and i_sl <= i_tp:
+        return i_sl, "sl"
+    if i_tp < n:
+        return i_tp, "tp"
+    return n, None
 
 def _first_close_at(minute_df: pd.DataFrame, hhmm: str) -> Optional[float]:
     try:
-        target_t = pd.Timestamp(hhmm).time()
-        row = minute_df.loc[minute_df.index.time == target_t]
-        return float(row["close"].iloc[0]) if not row.empty else None
+        target_t = _hhmm_time(hhmm)
+        hits = np.flatnonzero(_minute_of_day(minute_df.index) == target_t.hour * 60 + target_t.minute)
+        return float(minute_df["close"].to_numpy()[hits[0]]) if hits.size else None
     except Exception:
         return None
 
@@ -161,8 +198,9 @@ def load_day_window(date_str: str):
     missing_win  = int(len(tgt_win) - len(win))
     dupes        = int(or_slice.index.duplicated().sum() + win.index.duplicated().sum())
 
-    has_1022 = any(win.index.time == pd.Timestamp(ENTRY_T).time())
-    has_1200 = any(win.index.time == pd.Timestamp(EXIT_T).time())
+    win_mod  = _minute_of_day(win.index)
+    has_1022 = (win_mod == ENTRY_MOD).any()
+    has_1200 = (win_mod == EXIT_MOD).any()
 
     or_high = float(or_slice["high"].max()) if not or_slice.empty else None
     or_low  = float(or_slice["low"].min())  if not or_slice.empty else None
@@ -318,16 +356,20 @@ def execute_day(date_str: str) -> DayExecution:
             pnl_pts=0.0, pnl_usd=0.0, notes="Middle zone at 10:22; no position."
         )
 
-    entry_t = pd.Timestamp(sig.entry_time).time()
-    path = win.loc[win.index.time > entry_t].copy()  # 10:23 ... 12:00 inclusive
+    entry_t = _hhmm_time(sig.entry_time)
+    win_mod = _minute_of_day(win.index)
+    after = win_mod > entry_t.hour * 60 + entry_t.minute
+    path = win.loc[after]  # 10:23 ... 12:00 inclusive
+    close = path["close"].to_numpy(dtype="float64")
 
-    has_1200 = any(path.index.time == pd.Timestamp(EXIT_T).time()) or bool(qc.get("has_exit_1200"))
+    exit_hits = np.flatnonzero(win_mod[after] == EXIT_MOD)
+    has_1200 = bool(exit_hits.size) or bool(qc.get("has_exit_1200"))
     if not has_1200 and not path.empty:
-        hard_exit_time = path.index.max()
-    elif has_1200:
-        hard_exit_time = path.index[path.index.time == pd.Timestamp(EXIT_T).time()][0]
+        hard_exit_i = int(path.index.argmax())
+    elif exit_hits.size:
+        hard_exit_i = int(exit_hits[0])
     else:
-        hard_exit_time = None
+        hard_exit_i = None
 
     E  = float(sig.entry_price)
     SL = float(sig.sl)
@@ -338,33 +380,15 @@ def execute_day(date_str: str) -> DayExecution:
     exit_reason = None
 
     # Conservative tie-break
-    if sig.decision == "long":
-        for ts, row in path.iterrows():
-            hi, lo = float(row["high"]), float(row["low"])
-            touched_tp = hi >= TP
-            touched_sl = lo <= SL
-            if touched_tp and touched_sl:
-                exit_ts, exit_px, exit_reason = ts, SL, "sl"; break
-            elif touched_sl:
-                exit_ts, exit_px, exit_reason = ts, SL, "sl"; break
-            elif touched_tp:
-                exit_ts, exit_px, exit_reason = ts, TP, "tp"; break
-    elif sig.decision == "short":
-        for ts, row in path.iterrows():
-            hi, lo = float(row["high"]), float(row["low"])
-            touched_tp = lo <= TP
-            touched_sl = hi >= SL
-            if touched_tp and touched_sl:
-                exit_ts, exit_px, exit_reason = ts, SL, "sl"; break
-            elif touched_sl:
-                exit_ts, exit_px, exit_reason = ts, SL, "sl"; break
-            elif touched_tp:
-                exit_ts, exit_px, exit_reason = ts, TP, "tp"; break
+    i, hit = first_exit(path["high"].to_numpy(dtype="float64"), path["low"].to_numpy(dtype="float64"),
+                        SL, TP, is_long=(sig.decision == "long"))
+    if hit is not None:
+        exit_ts, exit_px, exit_reason = path.index[i], (SL if hit == "sl" else TP), hit
 
     if exit_ts is None:
-        if hard_exit_time is not None:
-            exit_ts = hard_exit_time
-            exit_px = float(path.loc[exit_ts, "close"])
+        if hard_exit_i is not None:
+            exit_ts = path.index[hard_exit_i]
+            exit_px = float(close[hard_exit_i])
             exit_reason = "time"
         else:
             return DayExecution(